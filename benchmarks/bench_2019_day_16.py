@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Compare the NumPy FFT for 2019 day 16 against the pure Python version
+it replaced, on the real input.
+
+Usage: python benchmarks/bench_2019_day_16.py
+"""
+import itertools
+import sys
+import time
+from collections.abc import Callable, Iterable
+
+import aoc.aoc2019
+from aoc.aoc2019 import day_16
+from aoc.util import Part, result_output_str
+
+KERNEL = [0, 1, 0, -1]
+
+
+def reference_part_one(lines: Iterable[str]) -> int:
+    def fft(inp: list[int]) -> list[int]:
+        outp = []
+        for i in range(1, len(inp) + 1):
+            kernel = itertools.chain.from_iterable(
+                itertools.repeat(k, i) for k in KERNEL
+            )
+            k_iter = itertools.cycle(kernel)
+            next(k_iter)
+            outp_val = sum(inp_v * k for inp_v, k in zip(inp, k_iter))
+            outp.append(abs(outp_val) % 10)
+        return outp
+
+    input_ = [int(i) for i in "".join(lines)]
+    for i in range(100):
+        input_ = fft(input_)
+    return sum(10 ** (7 - i) * x for i, x in enumerate(input_[:8]))
+
+
+def reference_part_two(lines: Iterable[str]) -> int:
+    input_ = [int(i) for i in "".join(lines)] * 10_000
+    offset = sum(10 ** (6 - i) * x for i, x in enumerate(input_[:7]))
+    seq = reversed(input_[offset:])
+    for _ in range(100):
+        seq = [s % 10 for s in itertools.accumulate(seq)]
+    return sum(digit * 10**i for i, digit in enumerate(seq[-8:]))
+
+
+IMPLEMENTATIONS: dict[str, dict[Part, Callable[[Iterable[str]], int]]] = {
+    "reference": {Part.ONE: reference_part_one, Part.TWO: reference_part_two},
+    "numpy": {Part.ONE: day_16.part_one, Part.TWO: day_16.part_two},
+}
+
+
+def main() -> int:
+    lines = list(aoc.aoc2019.get_input_file_lines(16))
+    all_correct = True
+    print(f"{'part':>4} " + " ".join(f"{name:>10}" for name in IMPLEMENTATIONS))
+    for part in Part:
+        expected = (
+            day_16.PART_ONE_RESULT if part == Part.ONE else day_16.PART_TWO_RESULT
+        )
+        timings = []
+        for name, funcs in IMPLEMENTATIONS.items():
+            start = time.perf_counter()
+            result = funcs[part](iter(lines))
+            timings.append(time.perf_counter() - start)
+            if result != expected:
+                all_correct = False
+                print(f"{name}: {result_output_str(expected, result)}")
+        speedup = timings[0] / timings[1] if timings[1] else float("inf")
+        print(
+            f"{part.value:>4} "
+            + " ".join(f"{t:>9.3f}s" for t in timings)
+            + f"  x{speedup:.1f}"
+        )
+    return int(not all_correct)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Count the probes and Intcode instructions 2019 day 19 executes, before
+and after it tracked the beam's edges with a probe cache. Before is the old
+solution's own edge walk, where every probe ran a fresh machine from
+the start of the program. After forks a machine paused at its first
+input. Fewer instructions per probe doesn't mean fewer probes, so
+compare both columns.
+
+Usage: python benchmarks/bench_2019_day_19.py
+"""
+import sys
+import time
+from collections.abc import Callable
+
+import aoc.aoc2019
+from aoc.aoc2019 import day_19
+from aoc.aoc2019.intcode import Intcode
+from aoc.util import Part, result_output_str
+
+
+class ProbeCounter:
+    """Probe with a fresh machine every time, as day 19 used to"""
+
+    def __init__(self, program: tuple[int, ...]):
+        self.program = program
+        self.probes = 0
+        self.instructions_run = 0
+
+    def __call__(self, x: int, y: int) -> int:
+        ic = Intcode(self.program)
+        ic.run(x)
+        ic.run(y)
+        self.probes += 1
+        self.instructions_run += ic.instructions_run
+        return ic.outputs[0]
+
+
+# The two functions below are day 19 as it was, with each part's
+# test(x, y) closure swapped for a shared probe that counts
+
+
+def baseline_part_one(test: ProbeCounter) -> int:
+    size = 50
+
+    edges = {0: (0, 0)}
+    xmin, xmax, y = 6, 6, 5
+    while True:
+
+        if y >= size:
+            break
+
+        # Find left edge
+        while test(xmin, y) == 0:
+            xmin += 1
+
+        # Find right edge
+        xmax += 1
+        while xmax < size and test(xmax, y) == 1:
+            xmax += 1
+        xmax -= 1
+
+        edges[y] = (xmin, xmax)
+
+        y += 1
+
+    total = 0
+    for y in range(size):
+        xmin, xmax = edges.get(y, (-1, -1))
+        total += sum(1 for x in range(size) if xmin <= x <= xmax)
+
+    return total
+
+
+def baseline_part_two(test: ProbeCounter) -> int:
+    size = 100
+    x, y = 6, 5
+    while True:
+
+        # Find next left edge (x, y)
+        while test(x, y) == 0:
+            x += 1
+
+        # Check if we can make a square
+        y_sq = y - (size - 1)
+        if test(x + size - 1, y_sq) == 1:
+            return 10_000 * x + y_sq
+
+        y += 1
+
+
+def before(program: tuple[int, ...], part: Part) -> tuple[int, int, int]:
+    probe = ProbeCounter(program)
+    result = (baseline_part_one if part == Part.ONE else baseline_part_two)(probe)
+    return result, probe.probes, probe.instructions_run
+
+
+def after(program: tuple[int, ...], part: Part) -> tuple[int, int, int]:
+    # Each part builds its own beam, as part_one and part_two do
+    beam = day_19.TractorBeam(program)
+    result = (day_19.count_pulled if part == Part.ONE else day_19.find_square)(beam)
+    return result, len(beam.probes), beam.instructions_run
+
+
+def main() -> int:
+    program = day_19.parse(aoc.aoc2019.get_input_file_lines(19))
+    strategies: dict[str, Callable[[tuple[int, ...], Part], tuple[int, int, int]]] = {
+        "before": before,
+        "after": after,
+    }
+    all_correct = True
+    print(f"{'part':>4} {'strategy':<8} {'probes':>8} {'instructions':>13} {'time':>8}")
+    for name, strategy in strategies.items():
+        for part in Part:
+            expected = (
+                day_19.PART_ONE_RESULT if part == Part.ONE else day_19.PART_TWO_RESULT
+            )
+            start = time.perf_counter()
+            result, probes, instructions_run = strategy(program, part)
+            elapsed = time.perf_counter() - start
+            if result != expected:
+                all_correct = False
+                print(f"{name}: {result_output_str(expected, result)}")
+            print(
+                f"{part.value:>4} {name:<8} {probes:>8} {instructions_run:>13} "
+                f"{elapsed:>7.3f}s"
+            )
+    return int(not all_correct)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Compare the fast Intcode engine against the reference engine
+on the 2019 days that spend most of their time running Intcode.
+
+Usage: python benchmarks/bench_2019_intcode.py [DAY ...]
+"""
+import functools
+import multiprocessing
+import sys
+import time
+from unittest import mock
+
+import aoc.aoc2019
+import aoc.aoc2019.intcode
+from aoc.aoc2019.intcode import Intcode, ReferenceIntcode, run_amplifiers
+from aoc.util import Part, result_output_str
+
+DAYS = (2, 5, 7, 9, 19)
+ENGINES = (ReferenceIntcode, Intcode)
+
+
+def time_part(day: int, part: Part, engine: type) -> tuple[float, int | str]:
+    puzzle_module = aoc.aoc2019.import_puzzle_module(day)
+    puzzle_func = puzzle_module.part_one if part == Part.ONE else puzzle_module.part_two
+    lines = list(aoc.aoc2019.get_input_file_lines(day))
+
+    # Days pick up the engine by name, either directly or through run_amplifiers.
+    # IntcodeFarm workers are forked while the patches are active.
+    with (
+        mock.patch.object(aoc.aoc2019.intcode, "Intcode", engine),
+        mock.patch.object(puzzle_module, "Intcode", engine, create=True),
+        mock.patch.object(
+            puzzle_module,
+            "run_amplifiers",
+            functools.partial(run_amplifiers, engine=engine),
+            create=True,
+        ),
+    ):
+        start = time.perf_counter()
+        result = puzzle_func(iter(lines))
+        elapsed = time.perf_counter() - start
+    return elapsed, result
+
+
+def main(argv: list[str]) -> int:
+    multiprocessing.set_start_method("fork")
+    days = tuple(map(int, argv)) or DAYS
+    all_correct = True
+    print(f"{'day':>3} {'part':>4} " + " ".join(f"{e.__name__:>18}" for e in ENGINES))
+    for day in days:
+        puzzle_module = aoc.aoc2019.import_puzzle_module(day)
+        for part in Part:
+            expected = (
+                puzzle_module.PART_ONE_RESULT
+                if part == Part.ONE
+                else puzzle_module.PART_TWO_RESULT
+            )
+            timings = []
+            for engine in ENGINES:
+                elapsed, result = time_part(day, part, engine)
+                timings.append(elapsed)
+                if result != expected:
+                    all_correct = False
+                    print(f"{engine.__name__}: {result_output_str(expected, result)}")
+            speedup = timings[0] / timings[1] if timings[1] else float("inf")
+            print(
+                f"{day:>3} {part.value:>4} "
+                + " ".join(f"{t:>17.3f}s" for t in timings)
+                + f"  x{speedup:.1f}"
+            )
+    return int(not all_correct)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,12 @@
 import argparse
+import datetime
 import logging
 import sys
+from pathlib import Path
 
-from aoc.run import run_puzzle
+# Keep imports here light, see --startup-report.
+# Each command imports what it needs when it runs.
+PROFILE_MODES = ("cprofile", "tracemalloc", "sampling")
 
 
 def main(argv) -> int:
@@ -22,8 +26,149 @@ def main(argv) -> int:
         required=False,
         help="Datestamp of puzzle to run (default today)",
     )
+    parser.add_argument(
+        "--year",
+        type=int,
+        default=None,
+        required=False,
+        help="Year of puzzles to run with --all",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Run every puzzle in --year in parallel and report timings",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        required=False,
+        help="Number of worker processes for --all (default CPU count)",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_MODES[0],
+        default=None,
+        choices=PROFILE_MODES,
+        help="Profile the puzzle run on the real input (default cprofile)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Number of hot functions or allocation sites to show (default 20)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=None,
+        help="Write collapsed stacks for flamegraph tools to this file "
+        "(tracemalloc and sampling only)",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Show how long a cold start spends importing modules for --date",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", title="commands")
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark puzzle solutions against a saved baseline"
+    )
+    bench_parser.add_argument(
+        "--year",
+        dest="years",
+        type=int,
+        required=True,
+        action="append",
+        help="Year of puzzles to benchmark",
+    )
+    bench_parser.add_argument(
+        "--day",
+        dest="days",
+        type=int,
+        required=False,
+        action="append",
+        help="Day to benchmark (default all days in the year)",
+    )
+    bench_parser.add_argument(
+        "--part",
+        dest="parts",
+        type=int,
+        required=False,
+        action="append",
+        help="Which part of the puzzle to benchmark (default both)",
+    )
+    bench_parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of timed runs (default 5)"
+    )
+    bench_parser.add_argument(
+        "--warmup", type=int, default=1, help="Number of untimed runs (default 1)"
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Baseline JSON file (default resources/bench.json)",
+    )
+    bench_parser.add_argument(
+        "--save", action="store_true", help="Write results to the baseline file"
+    )
+    bench_parser.add_argument(
+        "--compare", action="store_true", help="Compare results to the baseline file"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="Slowdown in median time that counts as a regression (default 0.1)",
+    )
+
+    fetch_parser = subparsers.add_parser(
+        "fetch", help="Download all missing puzzle inputs for a year"
+    )
+    fetch_parser.add_argument(
+        "--year", type=int, required=True, help="Year of inputs to download"
+    )
+    fetch_parser.add_argument(
+        "--day",
+        dest="days",
+        type=int,
+        required=False,
+        action="append",
+        help="Day to download (default all days in the year)",
+    )
+    fetch_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Maximum number of downloads at once (default 4)",
+    )
+    fetch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Minimum seconds between starting downloads (default 0.5)",
+    )
+    fetch_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds to wait for the server before giving up on a download "
+        "(default 30)",
+    )
+
     args = parser.parse_args(argv)
+    if args.all and args.year is None:
+        parser.error("--all requires --year")
+    if args.command == "bench" and args.repeat < 1:
+        bench_parser.error("--repeat must be at least 1")
+    if args.jobs is not None and args.jobs < 1:
+        (fetch_parser if args.command == "fetch" else parser).error(
+            "--jobs must be at least 1"
+        )
 
     if args.debug:
         logging.basicConfig(
@@ -33,7 +178,60 @@ def main(argv) -> int:
     else:
         logging.basicConfig(level=logging.INFO, format="%(message)s")
 
-    return int(not run_puzzle(args.date, args.parts))
+    if args.command == "bench":
+        from aoc.bench import DEFAULT_BASELINE_FILE, DEFAULT_THRESHOLD, run_bench
+
+        return int(
+            not run_bench(
+                args.years,
+                args.days,
+                args.parts,
+                args.repeat,
+                args.warmup,
+                args.baseline or DEFAULT_BASELINE_FILE,
+                args.save,
+                args.compare,
+                DEFAULT_THRESHOLD if args.threshold is None else args.threshold,
+            )
+        )
+    if args.command == "fetch":
+        from aoc.fetch import DEFAULT_INTERVAL, DEFAULT_JOBS, fetch_year
+        from aoc.util import DOWNLOAD_TIMEOUT
+
+        return int(
+            not fetch_year(
+                args.year,
+                args.days,
+                DEFAULT_JOBS if args.jobs is None else args.jobs,
+                DEFAULT_INTERVAL if args.interval is None else args.interval,
+                timeout=DOWNLOAD_TIMEOUT if args.timeout is None else args.timeout,
+            )
+        )
+    if args.startup_report:
+        from aoc.startup import startup_report
+
+        date = (
+            datetime.date.fromisoformat(args.date)
+            if args.date
+            else datetime.date.today()
+        )
+        logging.info(startup_report(date.year, date.day))
+        return 0
+    if args.all:
+        from aoc.run import run_year
+
+        return int(not run_year(args.year, args.parts, args.jobs))
+
+    from aoc.run import run_puzzle
+
+    profiler = None
+    if args.profile:
+        from aoc.profiling import Profiler, ProfileMode
+
+        profiler = Profiler(
+            ProfileMode(args.profile), args.profile_top, args.profile_output
+        )
+    return int(not run_puzzle(args.date, args.parts, profiler))
 
 
 def main_cli() -> int:
@@ -13,6 +13,7 @@ import itertools
 from collections.abc import Iterable
 
 from aoc.aoc2019.intcode import Intcode
+from aoc.aoc2019.intcode_farm import IntcodeFarm
 
 
 PART_ONE_EXAMPLE = """\
@@ -25,6 +26,13 @@ PART_TWO_EXAMPLE_RESULT = None
 PART_TWO_RESULT = 6421
 
 
+def run_with_noun_verb(program: Iterable[int], noun_verb: tuple[int, int]) -> int:
+    ic = Intcode(program)
+    ic.mem[1], ic.mem[2] = noun_verb
+    ic.run()
+    return ic.mem[0]
+
+
 def part_one(lines: Iterable[str]) -> int:
     program = [int(i) for i in "".join(lines).split(",")]
     ic = Intcode(program)
@@ -36,11 +44,11 @@ def part_one(lines: Iterable[str]) -> int:
 
 def part_two(lines: Iterable[str]) -> int:
     program = tuple(int(i) for i in "".join(lines).split(","))
-    for noun, verb in itertools.product(range(100), range(100)):
-        ic = Intcode(program)
-        ic.mem[1] = noun
-        ic.mem[2] = verb
-        ic.run()
-        if ic.mem[0] == 19690720:
-            return 100 * noun + verb
+    noun_verbs = list(itertools.product(range(100), range(100)))
+    with IntcodeFarm(program, chunksize=256) as farm:
+        for (noun, verb), result in zip(
+            noun_verbs, farm.map(run_with_noun_verb, noun_verbs)
+        ):
+            if result == 19690720:
+                return 100 * noun + verb
     return -1
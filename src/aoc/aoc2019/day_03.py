@@ -5,9 +5,14 @@ Given two runs of wire, find intersection point closest to 0,0.
 
 PART 2
 Find the intersection with the minimum number of total steps
+
+Each part finds the intersections with one sweep line pass.
 """
-import itertools
-from collections.abc import Iterable
+import bisect
+from collections.abc import Iterable, Iterator
+from operator import itemgetter
+
+from aoc.util import Pt, manhattan_distance
 
 
 PART_ONE_EXAMPLE = """\
@@ -22,6 +27,8 @@ PART_TWO_RESULT = 18542
 
 type WireSeg = tuple[int, int, int, int]
 type WireSegs = tuple[WireSeg, ...]
+# Point where the wires cross, total steps along both wires to get there
+type Crossing = tuple[Pt, int]
 
 
 def parse(line: str) -> tuple[WireSegs, WireSegs]:
@@ -47,49 +54,57 @@ def parse(line: str) -> tuple[WireSegs, WireSegs]:
     return tuple(hsegs), tuple(vsegs)
 
 
-def part_one(lines: Iterable[str]) -> int:
-    line1, line2 = list(lines)
-    w1hsegs, w1vsegs = parse(line1)
-    w2hsegs, w2vsegs = parse(line2)
+def find_crossings(
+    wire1: tuple[WireSegs, WireSegs], wire2: tuple[WireSegs, WireSegs]
+) -> Iterator[Crossing]:
+    """Every point other than the origin where one wire's horizontal segment
+    crosses the other wire's vertical segment, with the total steps
+    both wires take to get there.
+
+    Sweep a vertical line across from left to right. Keep the horizontal
+    segments the line is on sorted by y, one list per wire. At each vertical
+    segment, bisect for the other wire's horizontal segments in its y range."""
+    # At the same x, add horizontal segments, then check crossings, then remove
+    start, cross, end = 0, 1, 2
+    events: list[tuple[int, int, int, WireSeg]] = []
+    for wire, (hsegs, vsegs) in enumerate((wire1, wire2)):
+        for hseg in hsegs:
+            _, x_start, x_end, _ = hseg
+            events.append((min(x_start, x_end), start, wire, hseg))
+            events.append((max(x_start, x_end), end, wire, hseg))
+        for vseg in vsegs:
+            events.append((vseg[1], cross, wire, vseg))
+    events.sort(key=lambda event: event[:2])
+
+    # Horizontal segments the sweep line is on as (y, steps, x_start).
+    # Steps are different for every segment of a wire, so these are unique.
+    active: tuple[list[tuple[int, int, int]], ...] = ([], [])
+    for x, kind, wire, seg in events:
+        if kind == cross:
+            v_steps, _, y_start, y_end = seg
+            others = active[1 - wire]
+            lo = bisect.bisect_left(others, min(y_start, y_end), key=itemgetter(0))
+            hi = bisect.bisect_right(others, max(y_start, y_end), key=itemgetter(0))
+            for y, h_steps, x_start in others[lo:hi]:
+                if x != 0 or y != 0:
+                    steps = h_steps + abs(x - x_start) + v_steps + abs(y - y_start)
+                    yield (x, y), steps
+        else:
+            h_steps, x_start, _, y = seg
+            hseg_key = (y, h_steps, x_start)
+            if kind == start:
+                bisect.insort(active[wire], hseg_key)
+            else:
+                del active[wire][bisect.bisect_left(active[wire], hseg_key)]
 
-    min_intersection = 1 << 10  # Just making up some big value, hope it works
-    for (_, w1xstart, w1xend, w1y), (_, w2x, w2ystart, w2yend) in itertools.chain(
-        itertools.product(w1hsegs, w2vsegs), itertools.product(w2hsegs, w1vsegs)
-    ):
-        w1xmin, w1xmax = (w1xstart, w1xend) if w1xstart < w1xend else (w1xend, w1xstart)
-        w2ymin, w2ymax = (w2ystart, w2yend) if w2ystart < w2yend else (w2yend, w2ystart)
-        if w1xmin <= w2x <= w1xmax and w2ymin <= w1y <= w2ymax:
-            intersection_distance = abs(w2x) + abs(w1y)
-            if 0 < intersection_distance < min_intersection:
-                min_intersection = intersection_distance
 
-    return min_intersection
+def part_one(lines: Iterable[str]) -> int:
+    line1, line2 = list(lines)
+    crossings = tuple(find_crossings(parse(line1), parse(line2)))
+    return min(manhattan_distance(pt, (0, 0)) for pt, _ in crossings)
 
 
 def part_two(lines: Iterable[str]) -> int:
     line1, line2 = list(lines)
-    w1hsegs, w1vsegs = parse(line1)
-    w2hsegs, w2vsegs = parse(line2)
-
-    min_steps = 1 << 20  # Just making up some big value, hope it works
-    for (w1steps, w1xstart, w1xend, w1y), (
-        w2steps,
-        w2x,
-        w2ystart,
-        w2yend,
-    ) in itertools.chain(
-        itertools.product(w1hsegs, w2vsegs), itertools.product(w2hsegs, w1vsegs)
-    ):
-        w1xmin, w1xmax = (w1xstart, w1xend) if w1xstart < w1xend else (w1xend, w1xstart)
-        w2ymin, w2ymax = (w2ystart, w2yend) if w2ystart < w2yend else (w2yend, w2ystart)
-        if w1xmin <= w2x <= w1xmax and w2ymin <= w1y <= w2ymax:
-            # We have an intersection, and we know how many steps it took to get
-            # to the beginning of this segment for each wire.
-            # Now calc steps from beginning of seg to intersection
-            w1segsteps = abs(w2x - w1xstart)
-            w2segsteps = abs(w1y - w2ystart)
-            total_steps = w1steps + w1segsteps + w2steps + w2segsteps
-            if 0 < total_steps < min_steps:
-                min_steps = total_steps
-
-    return min_steps
+    crossings = tuple(find_crossings(parse(line1), parse(line2)))
+    return min(steps for _, steps in crossings)
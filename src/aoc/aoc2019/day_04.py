@@ -7,9 +7,15 @@ digits have at least one run of len two or more.
 
 PART 2
 Same rules as before, but digits must have a run of exactly two.
+
+Rather than check every number, count them digit by digit
+(a "digit DP"): how many ways are there to finish a number from
+(digits left, previous digit, current run length, rule met yet),
+while staying at or under the upper bound.
 """
-import itertools
+import functools
 from collections.abc import Iterable
+from enum import Enum
 
 
 PART_ONE_EXAMPLE = """\
@@ -22,6 +28,93 @@ PART_TWO_EXAMPLE_RESULT = None
 PART_TWO_RESULT = 609
 
 
+class Rule(Enum):
+    """Which runs of equal adjacent digits a password needs"""
+
+    PAIR = "at least one run of two or more"
+    EXACT_PAIR = "at least one run of exactly two"
+
+
+# Run lengths past this all count the same
+MAX_RUN = 3
+
+
+def add_digit(
+    rule: Rule, prev: int, run: int, met: bool, digit: int
+) -> tuple[int, bool]:
+    """Run length and whether the rule is met, after appending a digit"""
+    if digit == prev:
+        run = min(run + 1, MAX_RUN)
+    else:
+        if rule == Rule.EXACT_PAIR and run == 2:
+            met = True
+        run = 1
+    if rule == Rule.PAIR and run >= 2:
+        met = True
+    return run, met
+
+
+def is_met(rule: Rule, run: int, met: bool) -> bool:
+    """Whether a finished password meets the rule, counting its last run"""
+    return met or (rule == Rule.EXACT_PAIR and run == 2)
+
+
+@functools.cache
+def count_completions(
+    remaining: int, prev: int, run: int, met: bool, rule: Rule
+) -> int:
+    """Ways to add remaining digits, none less than prev,
+    so the whole password meets the rule"""
+    if remaining == 0:
+        return int(is_met(rule, run, met))
+    return sum(
+        count_completions(
+            remaining - 1, digit, *add_digit(rule, prev, run, met, digit), rule
+        )
+        for digit in range(prev, 10)
+    )
+
+
+def count_up_to(bound: int, rule: Rule) -> int:
+    """How many passwords from 1 to bound have non-decreasing digits
+    and meet the rule"""
+    if bound < 1:
+        return 0
+    bound_digits = get_digits(bound)
+    length = len(bound_digits)
+
+    # Any number with fewer digits is under the bound
+    total = sum(
+        count_completions(shorter - 1, digit, 1, False, rule)
+        for shorter in range(1, length)
+        for digit in range(1, 10)
+    )
+
+    # Follow the bound's digits. Going under the bound at any digit
+    # leaves the rest of the digits free.
+    prev, run, met = -1, 0, False
+    for position, bound_digit in enumerate(bound_digits):
+        lowest = max(prev, 1)
+        for digit in range(lowest, bound_digit):
+            total += count_completions(
+                length - position - 1,
+                digit,
+                *add_digit(rule, prev, run, met, digit),
+                rule,
+            )
+        if bound_digit < lowest:
+            # Digits would have to decrease to keep following the bound
+            return total
+        run, met = add_digit(rule, prev, run, met, bound_digit)
+        prev = bound_digit
+    # The bound itself
+    return total + is_met(rule, run, met)
+
+
+def count_in_range(lower: int, upper: int, rule: Rule) -> int:
+    return count_up_to(upper, rule) - count_up_to(lower - 1, rule)
+
+
 def get_digits(num: int) -> tuple[int, ...]:
     digits = []
     while num:
@@ -31,53 +124,14 @@ def get_digits(num: int) -> tuple[int, ...]:
     return tuple(reversed(digits))
 
 
-def get_num(digits: tuple[int, ...]) -> int:
-    num = 0
-    for d in digits:
-        num = num * 10 + d
-    return num
+def parse(lines: Iterable[str]) -> tuple[int, int]:
+    lower, upper = map(int, "".join(lines).split("-"))
+    return lower, upper
 
 
 def part_one(lines: Iterable[str]) -> int:
-
-    def adjacent_digits_same(digits: tuple[int, ...]) -> bool:
-        return any(d1 == d2 for d1, d2 in itertools.pairwise(digits))
-
-    lower, upper = list(map(int, "".join(lines).split("-")))
-    return sum(
-        adjacent_digits_same((d0, d1, d2, d3, d4, d5))
-        for d0 in range(lower // 100_000, upper // 100_000 + 1)
-        for d1 in range(d0, 10)
-        for d2 in range(d1, 10)
-        for d3 in range(d2, 10)
-        for d4 in range(d3, 10)
-        for d5 in range(d4, 10)
-        if lower <= get_num((d0, d1, d2, d3, d4, d5)) <= upper
-    )
+    return count_in_range(*parse(lines), Rule.PAIR)
 
 
 def part_two(lines: Iterable[str]) -> int:
-    def at_least_one_run_of_len_two(digits: tuple[int, ...]) -> bool:
-        # Left
-        if digits[0] == digits[1] != digits[2]:
-            return True
-        # Right
-        if digits[3] != digits[4] == digits[5]:
-            return True
-        # Middle
-        for i in (1, 2, 3):
-            if digits[i - 1] != digits[i] == digits[i + 1] != digits[i + 2]:
-                return True
-        return False
-
-    lower, upper = list(map(int, "".join(lines).split("-")))
-    return sum(
-        at_least_one_run_of_len_two((d0, d1, d2, d3, d4, d5))
-        for d0 in range(lower // 100_000, upper // 100_000 + 1)
-        for d1 in range(d0, 10)
-        for d2 in range(d1, 10)
-        for d3 in range(d2, 10)
-        for d4 in range(d3, 10)
-        for d5 in range(d4, 10)
-        if lower <= get_num((d0, d1, d2, d3, d4, d5)) <= upper
-    )
+    return count_in_range(*parse(lines), Rule.EXACT_PAIR)
@@ -11,10 +11,12 @@ PART 2
 Hook the output of the last amplifier back into the first and run until they stop.
 Find max output for all phase sequences (perms. of 56789).
 """
+import functools
 import itertools
 from collections.abc import Iterable
 
 from aoc.aoc2019.intcode import run_amplifiers
+from aoc.aoc2019.intcode_farm import IntcodeFarm
 
 
 PART_ONE_EXAMPLE = """\
@@ -30,15 +32,22 @@ PART_TWO_RESULT = 4039164
 def part_one(lines: Iterable[str]) -> int:
     program = [int(i) for i in "".join(lines).split(",")]
 
-    return max(
-        run_amplifiers(program, seq, False) for seq in itertools.permutations(range(5))
-    )
+    with IntcodeFarm(program, chunksize=8) as farm:
+        return max(
+            farm.map(
+                functools.partial(run_amplifiers, feedback=False),
+                itertools.permutations(range(5)),
+            )
+        )
 
 
 def part_two(lines: Iterable[str]) -> int:
     program = [int(i) for i in "".join(lines).split(",")]
 
-    return max(
-        run_amplifiers(program, seq, True)
-        for seq in itertools.permutations(range(5, 10))
-    )
+    with IntcodeFarm(program, chunksize=8) as farm:
+        return max(
+            farm.map(
+                functools.partial(run_amplifiers, feedback=True),
+                itertools.permutations(range(5, 10)),
+            )
+        )
@@ -8,14 +8,22 @@ PART 2
 Kill the asteroids in order starting from pointing up and rotating clockwise.
 Which will be the 200th asteroid killed?
 Answer is 100*x+y
+Directions are ordered clockwise with integer cross products, no angles,
+and the laser's firing order comes off a heap one asteroid at a time.
 """
+import functools
+import heapq
 import itertools
 import math
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 from aoc.util import Pt, sub, manhattan_distance
 
+
 PART_ONE_EXAMPLE = """\
 .#..##.###...#######
 ##.############..##.
@@ -45,134 +53,129 @@ PART_TWO_EXAMPLE_RESULT = 802
 PART_TWO_RESULT = 517
 
 
+# Maps with at least this many asteroids count what each can see in parallel
+PARALLEL_MIN_ASTEROIDS = 2_000
+STATIONS_PER_JOB = 64
+
+
 def parse(lines: Iterable[str]) -> set[Pt]:
     return {
         (x, y) for y, line in enumerate(lines) for x, c in enumerate(line) if c == "#"
     }
 
 
-def find_max_visible(asteroids: set[Pt]) -> tuple[Pt, dict[Pt, list[Pt]]]:
-    # Find the slope of the line from one asteroid to another
-    # For a given a1, only a single a2 can be on that slope.
-    # For counting purposes it doesn't matter which.
-    # But we do need to be careful to uniquely order them...
-    visible_slopes = defaultdict(dict)
-    for a1, a2 in itertools.combinations(asteroids, 2):
-        a_min = min(a1, a2)
-        a_max = max(a1, a2)
-        diff = sub(a_max, a_min)
-        diff_gcd = math.gcd(diff[0], diff[1])
-        smallest_integer_diff = diff[0] // diff_gcd, diff[1] // diff_gcd
-        min_dict = visible_slopes[a_min]
-        if smallest_integer_diff not in min_dict:
-            min_dict[smallest_integer_diff] = []
-        min_dict[smallest_integer_diff].append(a_max)
-
-        neg_smallest_integer_diff = -smallest_integer_diff[0], -smallest_integer_diff[1]
-        max_dict = visible_slopes[a_max]
-        if neg_smallest_integer_diff not in max_dict:
-            max_dict[neg_smallest_integer_diff] = []
-        max_dict[neg_smallest_integer_diff].append(a_min)
-
-    max_asteroid = (0, 0)
-    max_dict = {}
-    max_len = 0
-    for a, slope_dict in visible_slopes.items():
-        if (lsd := len(slope_dict)) > max_len:
-            max_asteroid = a
-            max_dict = slope_dict
-            max_len = lsd
-
-    return max_asteroid, max_dict
+def direction(start: Pt, end: Pt) -> Pt:
+    """Smallest integer step from start towards end.
+    Asteroids in the same direction block one another."""
+    dx, dy = sub(end, start)
+    step_gcd = math.gcd(dx, dy)
+    return dx // step_gcd, dy // step_gcd
+
+
+def half_turn(d: Pt) -> int:
+    """0 for directions from up (inclusive) clockwise to down (exclusive), else 1"""
+    dx, dy = d
+    return 0 if dx > 0 or (dx == 0 and dy < 0) else 1
+
+
+def compare_clockwise(a: Pt, b: Pt) -> int:
+    """Order directions clockwise starting from straight up, using only integers.
+    y grows downwards, so up is (0, -1)."""
+    if (a_half := half_turn(a)) != (b_half := half_turn(b)):
+        return a_half - b_half
+    # Within half a turn, b is clockwise of a when the cross product is positive
+    cross = a[0] * b[1] - a[1] * b[0]
+    return (cross < 0) - (cross > 0)
+
+
+def count_visible_from(
+    xs: np.ndarray, ys: np.ndarray, stations: Iterable[Pt]
+) -> list[int]:
+    """How many asteroids (at xs, ys) each station can see,
+    i.e. how many different directions there are to the others"""
+    # Pack each direction into one int, so we can count the unique ones
+    span = 2 * int(max(xs.max(), ys.max())) + 1
+    counts = []
+    for x, y in stations:
+        dx = xs - x
+        dy = ys - y
+        step_gcd = np.gcd(dx, dy)
+        others = step_gcd > 0
+        step_gcd = step_gcd[others]
+        packed = dx[others] // step_gcd * span + dy[others] // step_gcd
+        counts.append(len(np.unique(packed)))
+    return counts
+
+
+# Set in each worker process by _init_worker
+_worker_xs: np.ndarray | None = None
+_worker_ys: np.ndarray | None = None
+
+
+def _init_worker(xs: np.ndarray, ys: np.ndarray) -> None:
+    global _worker_xs, _worker_ys
+    _worker_xs, _worker_ys = xs, ys
+
+
+def _count_visible_in_worker(stations: list[Pt]) -> list[int]:
+    return count_visible_from(_worker_xs, _worker_ys, stations)
+
+
+def find_best_station(asteroids: set[Pt]) -> tuple[Pt, int]:
+    """The asteroid that can see the most others, and how many it sees.
+
+    Every asteroid has to look at every other one, so big maps
+    split the stations between worker processes."""
+    stations = sorted(asteroids)
+    xs = np.array([x for x, _ in stations], dtype=np.int64)
+    ys = np.array([y for _, y in stations], dtype=np.int64)
+    if len(stations) < PARALLEL_MIN_ASTEROIDS:
+        counts = count_visible_from(xs, ys, stations)
+    else:
+        jobs = [
+            stations[i : i + STATIONS_PER_JOB]
+            for i in range(0, len(stations), STATIONS_PER_JOB)
+        ]
+        with ProcessPoolExecutor(initializer=_init_worker, initargs=(xs, ys)) as pool:
+            counts = list(
+                itertools.chain.from_iterable(pool.map(_count_visible_in_worker, jobs))
+            )
+    best = max(range(len(stations)), key=counts.__getitem__)
+    return stations[best], counts[best]
+
+
+def laser_order(station: Pt, asteroids: set[Pt]) -> Iterator[Pt]:
+    """Asteroids in the order the laser at station vaporizes them
+
+    Asteroids are bucketed by direction, closest last so we can pop it.
+    A heap of (rotation, clockwise rank) picks the next bucket to fire at,
+    and a bucket goes back on the heap for the next rotation
+    until it is empty."""
+    buckets: dict[Pt, list[Pt]] = defaultdict(list)
+    for asteroid in asteroids:
+        if asteroid != station:
+            buckets[direction(station, asteroid)].append(asteroid)
+
+    clockwise = sorted(buckets, key=functools.cmp_to_key(compare_clockwise))
+    for d in clockwise:
+        buckets[d].sort(key=lambda pt: manhattan_distance(pt, station), reverse=True)
+    # Already sorted, so already a heap
+    heap = [(0, rank, d) for rank, d in enumerate(clockwise)]
+    while heap:
+        rotation, rank, d = heapq.heappop(heap)
+        bucket = buckets[d]
+        yield bucket.pop()
+        if bucket:
+            heapq.heappush(heap, (rotation + 1, rank, d))
 
 
 def part_one(lines: Iterable[str]) -> int:
-    asteroids = parse(lines)
-    _, max_dict = find_max_visible(asteroids)
-    return len(max_dict)
+    _, visible = find_best_station(parse(lines))
+    return visible
 
 
 def part_two(lines: Iterable[str]) -> int:
     asteroids = parse(lines)
-    max_asteroid, max_dict = find_max_visible(asteroids)
-
-    # We know we have the location of the maximum asteroid,
-    # all the slopes from this asteroid to every other,
-    # and keyed under those slopes we have unordered lists
-    # of all the asteroids at that slope.
-    # Ordering the lists will be easy based on the distance from
-    # here to there.
-    # (Later note: We reverse this sort order so we can quickly pop off
-    #  the closest point.)
-    # But we need a way to order the slopes as well,
-    # starting at "Up" and proceeding clockwise.
-    # I think we split into quadrants, find the slopes in each
-    # quadrant by checking signs of x and y, and we order by
-    # value of arctan. (Or just the ratio y/x.)
-    # NOTE:
-    # Pointing "up" and going clockwise in this system where "up" is -Y,
-    # is the same as starting from -Y and going CCW in a right-handed
-    # coordinate system.
-    # That makes it easier because we don't need to break out quadrants,
-    # only the +/-X semiplanes and the two points on the +/-Y axis.
-    def pt_sort_key(pt: Pt) -> int:
-        return manhattan_distance(pt, max_asteroid)
-
-    def slope_sort_key(slope_pts: tuple[Pt, list[Pt]]) -> float:
-        slope = slope_pts[0]
-        return slope[1] / slope[0]
-
-    up = (0, -1)
-    down = (0, 1)
-    ordered_slopes = []
-    # First add "Up" = -Y axis
-    if (up_pts := max_dict.get(up)) is not None:
-        ordered_slopes.append((up, sorted(up_pts, key=pt_sort_key, reverse=True)))
-
-    # Then add pts on the +X semiplane
-    # QIV: (x, y): (0, -1)->(1, 0), y/x: -inf->0
-    # QI: (x, y): (0, 1) -> (1, 0), y/x: 0->inf
-    ordered_slopes.extend(
-        sorted(
-            (
-                (slope, sorted(pts, key=pt_sort_key, reverse=True))
-                for slope, pts in max_dict.items()
-                if 0 < slope[0]
-            ),
-            key=slope_sort_key,
-        )
-    )
-
-    # Now add "Down": +Y axis
-    if (down_pts := max_dict.get(down)) is not None:
-        ordered_slopes.append((down, sorted(down_pts, key=pt_sort_key)))
-
-    # Lastly add points in the -X semiplane
-    # QII: (x, y): (0, 1) -> (-1, 0), y/x: -inf->0
-    # QIII: (x, y): (-1, 0)->(0, -1), y/x: 0->inf
-    ordered_slopes.extend(
-        sorted(
-            (
-                (slope, sorted(pts, key=pt_sort_key, reverse=True))
-                for slope, pts in max_dict.items()
-                if slope[0] < 0
-            ),
-            key=slope_sort_key,
-        )
-    )
-
-    # Now we have everything in some kind of order.
-    # But it's a nested order. The slopes are ordered among themselves,
-    # and within a slope the points on that line are ordered.
-    # How do we go about ordering it in a global way?
-    # Visit each slope in turn and pop a point off...
-    target_idx = 200
-    global_order = []
-    while len(global_order) < target_idx:
-        for slope, slope_pts in ordered_slopes:
-            if len(global_order) >= target_idx:
-                break
-            if slope_pts:
-                global_order.append(slope_pts.pop())
-    pt = global_order[-1]
-    return 100 * pt[0] + pt[1]
+    station, _ = find_best_station(asteroids)
+    x, y = next(itertools.islice(laser_order(station, asteroids), 199, None))
+    return 100 * x + y
@@ -13,7 +13,7 @@ i.e. how many steps the program runs.
 PART 2
 Feed the input a 1 to start. Print the output.
 """
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Iterable
 
 from aoc.util import Pt, add
@@ -47,17 +47,25 @@ def rotate_left(pt: Pt) -> Pt:
     return pt[1], -pt[0]
 
 
-def run_program(ic: Intcode, starting_value: int) -> dict[Pt, int]:
+def run_program(program: Iterable[int], starting_value: int) -> dict[Pt, int]:
+    camera: deque[int] = deque()
+    commands: deque[int] = deque()
+    ic = Intcode(program, inputs=camera, outputs=commands)
+
     pt = (0, 0)
     heading = (0, -1)
     squares = defaultdict(int)
     squares[pt] = starting_value
     while not ic.is_halted:
         # Feed current value as input
-        ic.run(squares[pt])
+        camera.append(squares[pt])
+        ic.run()
 
         # Get outputs
-        paint_output, turn_output = ic.outputs[-2:]
+        if not commands:
+            break
+        paint_output = commands.popleft()
+        turn_output = commands.popleft()
 
         # Paint current square
         squares[pt] = paint_output
@@ -73,15 +81,13 @@ def run_program(ic: Intcode, starting_value: int) -> dict[Pt, int]:
 
 def part_one(lines: Iterable[str]) -> int:
     program = [int(i) for i in "".join(lines).split(",")]
-    ic = Intcode(program)
-    squares = run_program(ic, 0)
+    squares = run_program(program, 0)
     return len(squares)
 
 
 def part_two(lines: Iterable[str]) -> str:
     program = [int(i) for i in "".join(lines).split(",")]
-    ic = Intcode(program)
-    squares = run_program(ic, 1)
+    squares = run_program(program, 1)
 
     # Print the output
     x_bounds = [0, 0]
@@ -7,11 +7,16 @@ Calculate an "energy" standin as the answer.
 
 PART 2
 How many steps before it repeats?
+Each axis is independent, so find when each axis repeats and take the LCM.
+All the axes are simulated at once with NumPy arrays, and an axis
+only needs to run half its cycle; see NBody.find_cycles.
 """
 import math
 import re
 from collections.abc import Iterable
 
+import numpy as np
+
 
 PART_ONE_EXAMPLE = """\
 <x=-8, y=-10, z=0>
@@ -28,6 +33,8 @@ PART_TWO_EXAMPLE_RESULT = 4686774924
 PART_TWO_RESULT = 528250271633772
 
 
+NUM_AXES = 3
+
 INPUT_VEC_RE = re.compile(r"<x=(?P<x>-?\d+), y=(?P<y>-?\d+), z=(?P<z>-?\d+)>")
 
 
@@ -39,82 +46,82 @@ def parse(lines: Iterable[str]) -> list[list[int]]:
     ]
 
 
-def step_axis(positions: list[int], velocities: list[int]) -> None:
-    num_planets = len(positions)
-
-    # Update velocities
-    for planet_idx1 in range(num_planets):
-        p1 = positions[planet_idx1]
-        for planet_idx2 in range(num_planets):
-            if planet_idx1 == planet_idx2:
-                continue
-            p2 = positions[planet_idx2]
-            if p1 < p2:
-                velocities[planet_idx1] += 1
-            elif p1 > p2:
-                velocities[planet_idx1] -= 1
-    # Update positions
-    for planet_idx in range(num_planets):
-        positions[planet_idx] = positions[planet_idx] + velocities[planet_idx]
-
-
-def find_cycle(pos: list[int], vel: list[int]) -> int:
-    """For a given axis, run the simulation until a state repeats.
-    Return first repeated step number.
-
-    Note: We assume state 0 is the state that gets repeated.
-    I don't think this is true in general but it is true for
-    all inputs I've seen in this puzzle, so we'll go with it."""
-    state_zero = (*pos, *vel)
-
-    # Take first step so we can actually enter the loop...
-    step_axis(pos, vel)
-    i = 1
-
-    # Loop until we get back to 0
-    while (*pos, *vel) != state_zero:
-        step_axis(pos, vel)
-        i += 1
-
-    return i
+class NBody:
+    """Positions and velocities of every body on every axis,
+    simulated together with NumPy. One row per axis, one column per body.
+    Stepping reuses the same buffers, so it allocates nothing."""
+
+    def __init__(self, positions: list[list[int]]):
+        num_bodies = len(positions)
+        self.positions = np.array(positions, dtype=np.int64).T.copy()
+        self.velocities = np.zeros_like(self.positions)
+
+        # Buffers for step
+        self._diffs = np.empty((NUM_AXES, num_bodies, num_bodies), dtype=np.int64)
+        self._gravity = np.empty((NUM_AXES, num_bodies), dtype=np.int64)
+
+    def step(self) -> None:
+        # Gravity pulls each body one unit towards every other body
+        np.subtract(
+            self.positions[:, np.newaxis, :],
+            self.positions[:, :, np.newaxis],
+            out=self._diffs,
+        )
+        np.sign(self._diffs, out=self._diffs)
+        np.add.reduce(self._diffs, axis=2, out=self._gravity)
+        np.add(self.velocities, self._gravity, out=self.velocities)
+        np.add(self.positions, self.velocities, out=self.positions)
+
+    def energy(self) -> int:
+        potential = np.abs(self.positions).sum(axis=0)
+        kinetic = np.abs(self.velocities).sum(axis=0)
+        return int((potential * kinetic).sum())
+
+    def find_cycles(self, batch: int = 4096) -> list[int]:
+        """Steps until each axis first returns to its starting state.
+
+        Stepping is reversible: mapping (p, v) to (p - v, -v) turns a step
+        into its inverse. A state with no velocity maps to itself, so if
+        an axis first stops at step t it retraces its steps back to the start
+        at step 2t. It has already got back at step t if it's where it started.
+
+        Steps run in batches, recording whether each axis is moving
+        and where it is. The batch is checked for stops afterwards."""
+        start = self.positions.copy()
+        moving = np.empty((batch, NUM_AXES), dtype=bool)
+        history = np.empty((batch, *self.positions.shape), dtype=np.int64)
+        cycles = [0] * NUM_AXES
+        steps = 0
+        while not all(cycles):
+            for i in range(batch):
+                self.step()
+                np.logical_or.reduce(self.velocities, axis=1, out=moving[i])
+                np.copyto(history[i], self.positions)
+
+            for axis in range(NUM_AXES):
+                if cycles[axis]:
+                    continue
+                stopped = np.flatnonzero(~moving[:, axis])
+                if len(stopped):
+                    i = int(stopped[0])
+                    stop_step = steps + i + 1
+                    at_start = np.array_equal(history[i, axis], start[axis])
+                    cycles[axis] = stop_step if at_start else 2 * stop_step
+            steps += batch
+        return cycles
 
 
 def part_one(lines: Iterable[str]) -> int:
     positions = parse(lines)
-    num_planets = len(positions)
-
-    # Break into the axes, operate on them independently
-    xs, ys, zs = list(map(list, zip(*positions)))
-    vxs, vys, vzs = [0] * num_planets, [0] * num_planets, [0] * num_planets
+    bodies = NBody(positions)
 
     steps = EXAMPLE_STEPS if positions[0] == [-8, -10, 0] else STEPS
     for _ in range(steps):
-        step_axis(xs, vxs)
-        step_axis(ys, vys)
-        step_axis(zs, vzs)
-
-    # Return value: Energy
-    # Recombine axes into position and velocity
-    # sum over planets product of abs pos and abs vel
-    positions = tuple(zip(xs, ys, zs))
-    velocities = tuple(zip(vxs, vys, vzs))
-    return sum(
-        sum(map(abs, positions[planet_idx])) * sum(map(abs, velocities[planet_idx]))
-        for planet_idx in range(num_planets)
-    )
+        bodies.step()
+    return bodies.energy()
 
 
 def part_two(lines: Iterable[str]) -> int:
-    positions = parse(lines)
-    num_planets = len(positions)
-
-    # Break into the axes, operate on them independently
-    xs, ys, zs = list(map(list, zip(*positions)))
-    vxs, vys, vzs = [0] * num_planets, [0] * num_planets, [0] * num_planets
-
-    # Find cycles for each axis independently
-    # Answer is LCM of cycle lens
-    x_cycle = find_cycle(xs, vxs)
-    y_cycle = find_cycle(ys, vys)
-    z_cycle = find_cycle(zs, vzs)
-    return math.lcm(x_cycle, y_cycle, z_cycle)
+    # The axes don't affect one another, so each has its own cycle.
+    # The whole system repeats at the LCM of the cycle lengths.
+    return math.lcm(*NBody(parse(lines)).find_cycles())
@@ -10,12 +10,12 @@ Now we need to beat the game...
 I'm playing it by hand but recording my inputs
 so I don't have to keep doing the same stuff.
 """
-import itertools
-from collections import defaultdict
+from collections import deque
 from collections.abc import Iterable
 
 import curses
 
+from aoc.util import Pt
 from aoc.aoc2019.intcode import Intcode
 
 PART_ONE_EXAMPLE = """\
@@ -143,26 +143,50 @@ TAS_INPUTS_MULTILINE = """\
 TAS = list(map(int, "".join(TAS_INPUTS_MULTILINE.split("\n")).split(",")))
 
 
+def read_screen(screen: deque[int], tiles: dict[Pt, int], score: int) -> int:
+    """Pop (x, y, tile) triples off the screen channel and draw them into tiles.
+    Return the latest score."""
+    while screen:
+        x = screen.popleft()
+        y = screen.popleft()
+        val = screen.popleft()
+        if x == -1 and y == 0:
+            score = val
+        else:
+            tiles[(x, y)] = val
+    return score
+
+
 def part_one(lines: Iterable[str]) -> int:
     program = [int(i) for i in "".join(lines).split(",")]
-    ic = Intcode(program)
+    screen: deque[int] = deque()
+    ic = Intcode(program, outputs=screen)
     ic.run()
-    return sum(tile == 2 for tile in ic.outputs[2::3])
+
+    blocks = 0
+    while screen:
+        screen.popleft()
+        screen.popleft()
+        blocks += screen.popleft() == 2
+    return blocks
 
 
 def part_two(lines: Iterable[str]) -> int:
     program = [int(i) for i in "".join(lines).split(",")]
-    ic = Intcode(program)
+    screen: deque[int] = deque()
+    ic = Intcode(program, outputs=screen)
     ic.mem[0] = 2  # Insert two quarters to play...
+    tiles: dict[Pt, int] = {}
     state = {"score": 0}
 
     # Run until we halt or wait for input
     ic.run()
+    score = read_screen(screen, tiles, 0)
 
     # Find boundaries for drawing
     y_bounds = [0, 0]
     x_bounds = [0, 0]
-    for x, y, _ in itertools.batched(ic.outputs, 3):
+    for x, y in tiles:
         if y > y_bounds[1]:
             y_bounds[1] = y
         elif y < y_bounds[0]:
@@ -175,6 +199,8 @@ def part_two(lines: Iterable[str]) -> int:
     # Run through all the TAS inputs
     for tas_input in TAS:
         ic.run(tas_input)
+        score = read_screen(screen, tiles, score)
+    state["score"] = score
 
     def main(stdscr):
         score = state["score"]
@@ -183,7 +209,7 @@ def part_two(lines: Iterable[str]) -> int:
         # Turn off cursor blinking
         curses.curs_set(0)
 
-        def draw(outputs: dict[int, dict[int, str]], score: int):
+        def draw(tiles: dict[Pt, int], score: int):
             # Clear the screen
             stdscr.clear()
 
@@ -191,9 +217,10 @@ def part_two(lines: Iterable[str]) -> int:
 
             # Now draw!
             for y in range(y_bounds[0], y_bounds[1] + 1):
-                row = outputs[y]
                 stdscr.addstr(
-                    y + 1, 0, "".join(row[x] for x in range(0, x_bounds[1] + 1))
+                    y + 1,
+                    0,
+                    "".join(OBJ[tiles[(x, y)]] for x in range(0, x_bounds[1] + 1)),
                 )
 
             # Refresh the screen to show changes
@@ -201,16 +228,8 @@ def part_two(lines: Iterable[str]) -> int:
 
         # Main loop, run until program is complete
         while not ic.is_halted:
-            # Gather outputs from previous step
-            outputs = defaultdict(dict)
-            for x, y, val in itertools.batched(ic.outputs, 3):
-                if x == -1 and y == 0:
-                    score = val
-                else:
-                    outputs[y][x] = OBJ[val]
-
             # Draw outputs
-            draw(outputs, score)
+            draw(tiles, score)
 
             # Wait for user input
             key = stdscr.getch()
@@ -225,11 +244,7 @@ def part_two(lines: Iterable[str]) -> int:
 
             # Pass it to the program
             ic.run(user_input)
-
-        # Get final score
-        for x, y, val in itertools.batched(ic.outputs, 3):
-            if x == -1 and y == 0:
-                score = val
+            score = read_screen(screen, tiles, score)
 
         # Clear the screen
         stdscr.clear()
@@ -252,8 +267,4 @@ def part_two(lines: Iterable[str]) -> int:
         return "TAS = " + str(TAS + state["tas"])
     else:
         # We won using only the TAS
-        score = 0
-        for x, y, val in itertools.batched(ic.outputs, 3):
-            if x == -1 and y == 0:
-                score = val
-        return score
+        return state["score"]
@@ -5,11 +5,18 @@ Given a reaction chain from ORE to FUEL,
 find the minimum number of ORE needed to make 1 FUEL.
 
 PART 2
+What is the most FUEL we can make with one trillion ORE?
+
+Chemicals are processed in topological order, so each one's total
+demand is known before we make it and one pass finds the ORE needed.
+The search for part two is bounded by the ORE per FUEL
+with and without leftovers.
 """
 import logging
 import math
+from collections import deque
 from collections.abc import Iterable
-from functools import cache, cmp_to_key
+from fractions import Fraction
 
 
 PART_ONE_EXAMPLE = """\
@@ -66,76 +73,71 @@ def parse(lines: Iterable[str]) -> Products:
 
 
 def sort_products(products: Products) -> list[str]:
-    @cache
-    def what_is_upstream_of_me(product: str) -> set[str]:
+    """Order chemicals so each comes before everything it is made from,
+    using Kahn's algorithm. FUEL comes first and ORE comes last."""
+    # How many reactions each chemical is used in
+    num_consumers = {product: 0 for product in products}
+    num_consumers[ORE] = 0
+    for _, reactants in products.values():
+        for _, reactant in reactants:
+            num_consumers[reactant] += 1
+
+    # Nothing is made from these
+    ready = deque(product for product, count in num_consumers.items() if count == 0)
+    order = []
+    while ready:
+        product = ready.popleft()
+        order.append(product)
         if product == ORE:
-            # log.debug("ORE upstream: {}")
-            return set()
+            continue
         _, reactants = products[product]
-        upstream = set()
         for _, reactant in reactants:
-            upstream.add(reactant)
-            upstream.update(what_is_upstream_of_me(reactant))
-        # log.debug("%s upstream: %s", product, upstream)
-        return upstream
-
-    def product_comparator(a: str, b: str):
-        ret = 0
-        if b in what_is_upstream_of_me(a):
-            ret = 1
-        if a in what_is_upstream_of_me(b):
-            ret = -1
-        la = len(what_is_upstream_of_me(a))
-        lb = len(what_is_upstream_of_me(b))
-        if la < lb:
-            ret = 1
-        if lb < la:
-            ret = -1
-        # log.debug("Cmp a=%s b=%s -> %d", a, b, ret)
-        return ret
-
-    return sorted(products, key=cmp_to_key(product_comparator))
+            num_consumers[reactant] -= 1
+            if num_consumers[reactant] == 0:
+                ready.append(reactant)
+
+    if len(order) != len(num_consumers):
+        raise ValueError("Reactions contain a cycle")
+    return order
 
 
 def find_num_ore_per_fuel(
     num_fuel: int, products: Products, sorted_products: list[str]
 ) -> int:
-
-    # log.debug("Starting needs with %d FUEL", num_fuel)
-    needs = {FUEL: num_fuel}
+    """Make num_fuel FUEL, in one pass over the chemicals in order.
+    Every use of a chemical is known by the time we reach it,
+    so we can make all we need of it at once."""
+    needs = dict.fromkeys(sorted_products, 0)
+    needs[FUEL] = num_fuel
     for product in sorted_products:
-        # Pull out another thing we need to have on hand to make fuel
         req_amt = needs[product]
-        # log.debug("Need %d %s", req_amt, product)
-
         if product == ORE:
             # Nothing makes ore, it just is
             return req_amt
+        if req_amt == 0:
+            continue
 
-        # Time to make the donuts
-        # How do we make this thing, and in what quantity?
         unit_of_production, reactants = products[product]
+        num_units = -(-req_amt // unit_of_production)
+        for reactant_amt, reactant in reactants:
+            needs[reactant] += num_units * reactant_amt
+
+    return needs[ORE]
 
-        # Find out the minimum number we have to make
-        num_units = math.ceil(req_amt / unit_of_production)
 
-        # In order to make this, we need a bunch of precursors
-        # Add those to the needs
+def find_ore_per_fuel_limit(products: Products, sorted_products: list[str]) -> Fraction:
+    """ORE per FUEL if reactions could make fractions of a unit.
+    Leftovers only ever add to this, so it's a lower bound
+    on the ORE per FUEL of any amount of FUEL."""
+    needs = dict.fromkeys(sorted_products, Fraction(0))
+    needs[FUEL] = Fraction(1)
+    for product in sorted_products:
+        if product == ORE:
+            break
+        unit_of_production, reactants = products[product]
+        num_units = needs[product] / unit_of_production
         for reactant_amt, reactant in reactants:
-            num_reactant_units = num_units * reactant_amt
-            if reactant in needs:
-                needs[reactant] += num_reactant_units
-                # log.debug(
-                #     "Adding %d to %s. New total = %d",
-                #     num_reactant_units,
-                #     reactant,
-                #     needs[reactant],
-                # )
-            else:
-                # log.debug(
-                #     "Adding new need %s. total = %d", reactant, num_reactant_units
-                # )
-                needs[reactant] = num_reactant_units
+            needs[reactant] += num_units * reactant_amt
 
     return needs[ORE]
 
@@ -149,22 +151,24 @@ def part_one(lines: Iterable[str]) -> int:
 def part_two(lines: Iterable[str]) -> int:
     products = parse(lines)
     sorted_products = sort_products(products)
-    fuel_range = (
-        [100_000, 1_000_000]
-        if "CNZTR" in products and 8 == products["CNZTR"][0]
-        else [1_000_000, 10_000_000]
-    )
 
-    # Binary search through fuel values
-    while fuel_range[1] > fuel_range[0] + 1:
-        log.debug("RANGE (%d, %d)", fuel_range[0], fuel_range[1])
+    # Making FUEL in bulk never costs more per FUEL than making one,
+    # and never less than it would if there were no leftovers
+    ore_for_one = find_num_ore_per_fuel(1, products, sorted_products)
+    ore_limit = find_ore_per_fuel_limit(products, sorted_products)
+    low = ONE_TRILLION // ore_for_one
+    high = math.floor(ONE_TRILLION / ore_limit)
+
+    # Binary search for the most fuel we can make, which is in [low, high]
+    while low < high:
+        log.debug("RANGE (%d, %d)", low, high)
 
-        fuel = (fuel_range[1] + fuel_range[0]) // 2
+        fuel = (low + high + 1) // 2
         ore = find_num_ore_per_fuel(fuel, products, sorted_products)
         log.debug("FUEL %d ORE %d", fuel, ore)
         if ore > ONE_TRILLION:
-            fuel_range[1] = fuel - 1
+            high = fuel - 1
         else:
-            fuel_range[0] = fuel
+            low = fuel
 
-    return fuel_range[0]
+    return low
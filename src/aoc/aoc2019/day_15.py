@@ -30,11 +30,9 @@ INSTRUCTION_DIRECTION = {
 }
 
 
-def walk(
-    program: Iterable[int], stop_early: bool
-) -> tuple[Pt, set[Pt], tuple[int, ...]]:
-    # queue: (current position, instructions to get here)
-    queue: deque[tuple[Pt, tuple[int, ...]]] = deque([((0, 0), ())])
+def walk(program: Iterable[int], stop_early: bool) -> tuple[Pt, set[Pt], int]:
+    # queue: (current position, steps to get here, robot paused at this position)
+    queue: deque[tuple[Pt, int, Intcode]] = deque([((0, 0), 0, Intcode(program))])
 
     # visited: set of points that some robot has visited
     visited = set()
@@ -48,13 +46,13 @@ def walk(
         # Pop a robot off the stack
         # Look in each direction
         # - If someone else has visited, can't go there
-        # - Else, make a new robot, feed it the same path + the one new step
-        # - Check the robot's output.
+        # - Else, fork the robot and have the fork take the one new step
+        # - Check the fork's output.
         # -- If it's a wall, can't go there
-        # -- If it's the destination, return your instruction sequence (part 1 only)
+        # -- If it's the destination, return the number of steps (part 1 only)
         # -- Else, onto the queue you go
 
-        pt, instructions = queue.popleft()
+        pt, steps, robot = queue.popleft()
 
         if pt in visited:
             continue
@@ -64,39 +62,34 @@ def walk(
             new_pt = add(pt, new_direction)
             if new_pt in visited or new_pt in walls:
                 continue
-            # Make a new robot
-            robot = Intcode(program)
-            # Give it all the same instructions to get here
-            for i in instructions:
-                robot.run(i)
+            # Make a new robot that starts where this one is
+            new_robot = robot.fork()
             # Take the next step
-            robot.run(new_instruction)
-            result = robot.outputs[-1]
+            new_robot.run(new_instruction)
+            result = new_robot.outputs.pop()
             if result == 0:
                 # Wall. Invalid move.
                 walls.add(new_pt)
                 continue
             # Valid move
-            new_instructions = (*instructions, new_instruction)
             if result == 2:
                 if stop_early:
-                    return new_pt, walls, new_instructions
+                    return new_pt, walls, steps + 1
                 else:
                     oxygen_pt = new_pt
-                    queue.append((new_pt, new_instructions))
+                    queue.append((new_pt, steps + 1, new_robot))
             elif result == 1:
-                # Add instructions to the queue
-                queue.append((new_pt, new_instructions))
+                queue.append((new_pt, steps + 1, new_robot))
             else:
                 raise RuntimeError(f"Unknown robot result: {result}")
-    return oxygen_pt, walls, ()
+    return oxygen_pt, walls, 0
 
 
 def part_one(lines: Iterable[str]) -> int:
     program = tuple(int(i) for i in "".join(lines).split(","))
 
-    _, _, instructions = walk(program, stop_early=True)
-    return len(instructions)
+    _, _, steps = walk(program, stop_early=True)
+    return steps
 
 
 def part_two(lines: Iterable[str]) -> int:
@@ -1,12 +1,21 @@
 #!/usr/bin/env python
 """
 PART 1
+Output digit i (counting from 1) adds up runs of i input digits,
+alternately added and subtracted, with gaps of i between them.
+Take prefix sums of the input, and each run's sum is a difference
+of two prefix sums. The runs are the same every phase, so work out
+where they all start and end once.
 
 PART 2
+The offset is in the second half of the sequence, where each output
+digit is the sum of the input digits from there to the end.
+So each phase is a cumulative sum from the end, mod 10.
 """
-import itertools
 from collections.abc import Iterable
 
+import numpy as np
+
 
 PART_ONE_EXAMPLE = """\
 80871224585914546619083218645595"""
@@ -18,51 +27,57 @@ PART_TWO_EXAMPLE_RESULT = 84462026
 PART_TWO_RESULT = 53201602
 
 
-KERNEL = [0, 1, 0, -1]
+PHASES = 100
 
 
-def part_one(lines: Iterable[str]) -> int:
-    def fft(inp: list[int]) -> list[int]:
-        outp = []
-        for i in range(1, len(inp) + 1):
-            # Expand kernel
-            kernel = itertools.chain.from_iterable(
-                itertools.repeat(k, i) for k in KERNEL
-            )
-            # Make an iterator that goes forever
-            k_iter = itertools.cycle(kernel)
-            # Drop the first element
-            next(k_iter)
-
-            # Perform the operation
-            outp_val = sum(inp_v * k for inp_v, k in zip(inp, k_iter))
-
-            # Keep only the ones-digit
-            outp.append(abs(outp_val) % 10)
-        return outp
-
-    input_ = [int(i) for i in "".join(lines)]
-    for i in range(100):
-        input_ = fft(input_)
-    return sum(10 ** (7 - i) * x for i, x in enumerate(input_[:8]))
+def read_digits(lines: Iterable[str]) -> list[int]:
+    return [int(i) for i in "".join(lines)]
 
 
-def part_two(lines: Iterable[str]) -> int:
-    input_ = [int(i) for i in "".join(lines)] * 10_000
-    offset = sum(10 ** (6 - i) * x for i, x in enumerate(input_[:7]))
+def digits_to_int(digits: Iterable[int]) -> int:
+    return int("".join(map(str, digits)))
+
 
-    # In the second half of the input sequence,
-    # (which the offset will be chosen to give us)
-    # the coefficients are just one from a given digit to the end.
-    # A number in the output sequence will be the cumulative sum
-    # from that input digit to the end.
+def find_runs(n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Start, end (exclusive), sign, and output digit of every run
+    of the pattern for an n digit sequence"""
+    starts, signs, outputs = [], [], []
+    for length in range(1, n + 1):
+        for first_start, sign in ((length - 1, 1), (3 * length - 1, -1)):
+            run_starts = np.arange(first_start, n, 4 * length)
+            starts.append(run_starts)
+            signs.append(np.full(len(run_starts), sign))
+            outputs.append(np.full(len(run_starts), length - 1))
+    start = np.concatenate(starts)
+    end = np.minimum(start + np.concatenate(outputs) + 1, n)
+    return start, end, np.concatenate(signs), np.concatenate(outputs)
 
-    # Keep the last $offset and reverse the sequence
-    seq = reversed(input_[offset:])
 
-    # Take 100 cumulative sums (mod 10)
-    for _ in range(100):
-        seq = [s % 10 for s in itertools.accumulate(seq)]
+def part_one(lines: Iterable[str]) -> int:
+    digits = np.array(read_digits(lines), dtype=np.int64)
+    n = len(digits)
+    start, end, sign, output = find_runs(n)
+
+    prefix_sums = np.zeros(n + 1, dtype=np.int64)
+    for _ in range(PHASES):
+        np.cumsum(digits, out=prefix_sums[1:])
+        run_sums = (prefix_sums[end] - prefix_sums[start]) * sign
+        totals = np.zeros(n, dtype=np.int64)
+        np.add.at(totals, output, run_sums)
+        digits = np.abs(totals) % 10
+    return digits_to_int(digits[:8])
 
-    # Read off the last 8 digits
-    return sum(digit * 10**i for i, digit in enumerate(seq[-8:]))
+
+def part_two(lines: Iterable[str]) -> int:
+    digits = read_digits(lines)
+    offset = digits_to_int(digits[:7])
+    total_length = len(digits) * 10_000
+    assert offset >= total_length // 2, "Offset must be in the second half"
+
+    # The digits from the offset to the end, last digit first
+    tail = np.tile(np.array(digits[::-1], dtype=np.int32), 10_000)
+    seq = tail[: total_length - offset]
+    for _ in range(PHASES):
+        seq = np.cumsum(seq, dtype=np.int32)
+        seq %= 10
+    return digits_to_int(seq[:-9:-1])
@@ -31,6 +31,7 @@ C: R,8,R,10,L,6
 A,A,B,C,C,A,C,B,C,B
 """
 import logging
+from collections import deque
 from collections.abc import Iterable
 
 from aoc.util import add
@@ -52,7 +53,8 @@ is_debug = log.isEnabledFor(logging.DEBUG)
 
 def part_one(lines: Iterable[str]) -> int:
     program = [int(i) for i in "".join(lines).split(",")]
-    ic = Intcode(program)
+    camera: deque[int] = deque()
+    ic = Intcode(program, outputs=camera)
     ic.run()
 
     walls_or_robot = [ord(c) for c in ("#", "<", ">", "^", "v")]
@@ -62,7 +64,8 @@ def part_one(lines: Iterable[str]) -> int:
     y = 0
     x = 0
     dbg = ""
-    for n in ic.outputs:
+    while camera:
+        n = camera.popleft()
         if n == newline:
             y += 1
             x = 0
@@ -94,10 +97,9 @@ def part_two(lines: Iterable[str]) -> int:
 
     # "wake the robot up"
     program[0] = 2
-    ic = Intcode(program)
 
-    # Setup
-    ic.run()
+    # We only want the very last output, the rest is the camera feed
+    outputs: deque[int] = deque(maxlen=1)
 
     # inputs
     movement_sequence = "A,A,B,C,C,A,C,B,C,B\n"
@@ -105,8 +107,13 @@ def part_two(lines: Iterable[str]) -> int:
     b = "L,12,L,6,R,10,L,6\n"
     c = "R,8,R,10,L,6\n"
     camera = "n\n"
-    for input_str in movement_sequence, a, b, c, camera:
-        for c in input_str:
-            ic.run(ord(c))
+    inputs = deque(
+        ord(char)
+        for input_str in (movement_sequence, a, b, c, camera)
+        for char in input_str
+    )
+
+    ic = Intcode(program, inputs=inputs, outputs=outputs)
+    ic.run()
 
-    return ic.outputs[-1]
+    return outputs[-1]
@@ -2,9 +2,17 @@
 """
 PART 1
 Navigate a BFS with keys and locks.
+Find the shortest paths between every pair of keys (and from the start),
+noting the doors and keys in the way. Then search shortest paths over
+(position, keys held) on that much smaller graph, keys held as a bitmask.
+The search is Dijkstra, guided A*-style by a lower bound on the steps left.
 
 PART 2
+Same, with four robots. Search state is (all robot positions, keys held),
+and each move sends one robot to a new key.
 """
+import functools
+import heapq
 import logging
 import string
 from collections import deque
@@ -41,153 +49,180 @@ PART_TWO_RESULT = 1642
 
 log = logging.getLogger(__name__)
 
-
-def part_one(lines: Iterable[str]) -> int:
-    start: Pt = (0, 0)
-    keys: dict[Pt, str] = {}
-    locks: dict[Pt, str] = {}
-    walls: set[Pt] = set()
-
-    for y, line in enumerate(lines):
-        for x, c in enumerate(line):
-            if c == "#":
-                walls.add((x, y))
-            elif c in string.ascii_lowercase:
-                keys[(x, y)] = c
-            elif c in string.ascii_uppercase:
-                locks[(x, y)] = c
-            elif c == "@":
-                start = (x, y)
-
-    num_keys = len(keys)
-
-    # visited: K (pt, set(keys)), V: steps
-    visited = {}
-    # queue: steps, pt, acquired_keys
-    queue = deque([(0, start, frozenset())])
+# Keys and doors are stored in an int bitmask, bit 0 for a/A, bit 1 for b/B, ...
+type KeyMask = int
+NUM_KEYS = 26
+# Key path: target key index, steps to reach it, mask of doors and keys in the way
+type KeyPath = tuple[int, int, KeyMask]
+
+# Search state packed into one int: the keys held in the low NUM_KEYS bits,
+# then ROBOT_BITS for each robot's position. Positions are
+# a key index, or NUM_KEYS + i for robot i's start.
+type State = int
+ROBOT_BITS = 6
+ROBOT_MASK = (1 << ROBOT_BITS) - 1
+
+
+def key_index(c: str) -> int:
+    return ord(c.lower()) - ord("a")
+
+
+def robot_shift(robot: int) -> int:
+    return NUM_KEYS + ROBOT_BITS * robot
+
+
+def parse(lines: Iterable[str], split_start: bool) -> tuple[list[list[str]], list[Pt]]:
+    grid = [list(line) for line in lines if line]
+    starts = [
+        (x, y) for y, row in enumerate(grid) for x, c in enumerate(row) if c == "@"
+    ]
+    if split_start and len(starts) == 1:
+        # Wall off the start and put a robot on each diagonal
+        x, y = starts[0]
+        for wx, wy in (starts[0], *neighbors(starts[0])):
+            grid[wy][wx] = "#"
+        starts = list(diags((x, y)))
+        for sx, sy in starts:
+            grid[sy][sx] = "@"
+    return grid, starts
+
+
+def find_key_paths(grid: list[list[str]], start: Pt) -> list[KeyPath]:
+    """BFS from start to every key it can reach, recording which
+    doors and other keys we pass on the way.
+
+    Where the maze has loops, a longer way round can avoid a door,
+    so we keep every path to a point that isn't beaten by a path
+    that was shorter and had nothing extra in the way."""
+    paths = []
+    visited: dict[Pt, list[KeyMask]] = {start: [0]}
+    queue = deque([(start, 0, 0)])
     while queue:
-        steps, pt, acquired_keys = queue.popleft()
-
-        v_key = (pt, acquired_keys)
-        if (v_steps := visited.get(v_key)) is not None and v_steps <= steps:
-            # Been here before in fewer steps
-            continue
-        visited[v_key] = steps
-
-        # Are we done?
-        if len(acquired_keys) == num_keys:
-            return steps
-
-        # Where to next?
-        n_steps = steps + 1
+        pt, steps, in_the_way = queue.popleft()
         for n in neighbors(pt):
-            if n in walls:
-                # Can't walk into walls
-                continue
-            if (lock := locks.get(n)) is not None and lock.lower() not in acquired_keys:
-                # We haven't opened this lock yet
+            x, y = n
+            c = grid[y][x]
+            if c == "#":
                 continue
-
-            if (
-                n_v_steps := visited.get((n, acquired_keys))
-            ) is not None and n_v_steps <= n_steps:
-                # Don't retrace steps
+            seen = visited.setdefault(n, [])
+            if any(mask & in_the_way == mask for mask in seen):
                 continue
-
-            # Looks like a valid destination
-            # Did we acquire another key?
-            if (n_key := keys.get(n)) is not None:
-                n_acquired_keys = acquired_keys | {n_key}
-            else:
-                n_acquired_keys = acquired_keys
-            queue.append((n_steps, n, n_acquired_keys))
-
-    return -1
-
-
-def part_two(lines: Iterable[str]) -> int:
-    starts: list[Pt] = []
-    keys: dict[Pt, str] = {}
-    locks: dict[Pt, str] = {}
-    walls: set[Pt] = set()
-
-    for y, line in enumerate(lines):
-        for x, c in enumerate(line):
-            if c == "#":
-                walls.add((x, y))
-            elif c in string.ascii_lowercase:
-                keys[(x, y)] = c
+            seen.append(in_the_way)
+            n_in_the_way = in_the_way
+            if c in string.ascii_lowercase:
+                paths.append((key_index(c), steps + 1, in_the_way))
+                n_in_the_way |= 1 << key_index(c)
             elif c in string.ascii_uppercase:
-                locks[(x, y)] = c
-            elif c == "@":
-                walls.add((x, y))
-                walls.update(neighbors((x, y)))
-                starts = list(diags((x, y)))
-
-    num_keys = len(keys)
-
-    # visited: K (pts, set(keys)), V: steps
-    visited = {(pt, frozenset()): 0 for pt in starts[1:]}
-    # queue: total_steps, moved_idx, steps, pts, acquired_keys
-    queue = deque([(0, 0, [0] * 4, starts, frozenset())])
-    while queue:
-        total_steps, moved_idx, steps, pts, acquired_keys = queue.popleft()
+                n_in_the_way |= 1 << key_index(c)
+            queue.append((n, steps + 1, n_in_the_way))
+    return paths
+
+
+def collect_keys(grid: list[list[str]], starts: list[Pt]) -> int:
+    """Fewest total steps for the robots to collect all keys.
+
+    The maze is reduced to a graph of the robots' starts and the keys,
+    then we run A* over (robot positions, keys held)."""
+    key_pts = {
+        key_index(c): (x, y)
+        for y, row in enumerate(grid)
+        for x, c in enumerate(row)
+        if c in string.ascii_lowercase
+    }
+    key_paths = {
+        node: find_key_paths(grid, pt)
+        for node, pt in (
+            *((NUM_KEYS + robot, pt) for robot, pt in enumerate(starts)),
+            *key_pts.items(),
+        )
+    }
+    # Shortest steps from each node to each key it can reach, ignoring doors
+    distances: dict[int, dict[int, int]] = {}
+    for node, paths in key_paths.items():
+        node_distances = distances[node] = {}
+        for key, key_steps, _ in paths:
+            node_distances[key] = min(key_steps, node_distances.get(key, key_steps))
+    # For each node, the keys it can reach, nearest first
+    nearest_keys = {
+        node: sorted(
+            ((1 << key, key_steps) for key, key_steps in node_distances.items()),
+            key=lambda bit_steps: bit_steps[1],
+        )
+        for node, node_distances in distances.items()
+    }
+
+    all_keys = sum(1 << key for key in key_pts)
+    shifts = [robot_shift(robot) for robot in range(len(starts))]
+    regions = [
+        sum(1 << key for key in distances[NUM_KEYS + robot])
+        for robot in range(len(starts))
+    ]
+    separate_regions = sum(map(int.bit_count, regions)) == all_keys.bit_count()
+
+    @functools.cache
+    def spanning_tree_steps(keys: KeyMask) -> int:
+        """Total steps of a minimum spanning tree over keys, by Prim's algorithm"""
+        first, *rest = (key for key in range(NUM_KEYS) if keys >> key & 1)
+        to_tree = {key: distances[first][key] for key in rest}
+        total = 0
+        while to_tree:
+            closest = min(to_tree, key=to_tree.__getitem__)
+            total += to_tree.pop(closest)
+            for key, key_steps in to_tree.items():
+                to_tree[key] = min(key_steps, distances[closest][key])
+        return total
+
+    def steps_left_at_least(state: State) -> int:
+        """Each robot has to walk to a key it needs, then between all
+        the rest of them, which is at least a spanning tree over them"""
+        if not separate_regions:
+            # A robot's keys might be fetched by another robot
+            return 0
+        missing = all_keys & ~state
+        total = 0
+        for shift, region in zip(shifts, regions):
+            if needed := missing & region:
+                total += spanning_tree_steps(needed) + next(
+                    key_steps
+                    for bit, key_steps in nearest_keys[(state >> shift) & ROBOT_MASK]
+                    if needed & bit
+                )
+        return total
 
-        v_key = (pts[moved_idx], acquired_keys)
-        if (v_steps := visited.get(v_key)) is not None and v_steps <= steps[moved_idx]:
-            # Been here before in fewer steps
+    start_state = sum(
+        (NUM_KEYS + robot) << shifts[robot] for robot in range(len(starts))
+    )
+    best = {start_state: 0}
+    queue = [(steps_left_at_least(start_state), 0, start_state)]
+    while queue:
+        _, steps, state = heapq.heappop(queue)
+        keys = state & all_keys
+        if keys == all_keys:
+            return steps
+        if best[state] < steps:
             continue
-        visited[v_key] = steps[moved_idx]
-
-        # Are we done?
-        if len(acquired_keys) == num_keys:
-            return total_steps
-
-        # Where to next?
-        new_total_steps = total_steps + 1
-        for next_move_idx in range(len(pts)):
-            # log.info("Moving pt %d", pt_idx)
-            new_steps = list(steps)
-            new_steps[next_move_idx] += 1
-            for n in neighbors(pts[next_move_idx]):
-                # log.info("Pt %d neighbor %s", pt_idx, n)
-                if n in walls:
-                    # Can't walk into walls
-                    # log.info(" + Wall")
-                    continue
 
-                if (
-                    lock := locks.get(n)
-                ) is not None and lock.lower() not in acquired_keys:
-                    # We haven't opened this lock yet
-                    # log.info(" + Locked")
+        for shift in shifts:
+            robot_cleared = state & ~(ROBOT_MASK << shift)
+            for key, key_steps, in_the_way in key_paths[(state >> shift) & ROBOT_MASK]:
+                if keys >> key & 1 or in_the_way & ~keys:
+                    # Already have it, or we'd have to go through
+                    # a locked door or pick up another key first
                     continue
-
-                new_pts = list(pts)
-                new_pts[next_move_idx] = n
-                new_visited_key = (n, acquired_keys)
-                if (
-                    new_steps_v := visited.get(new_visited_key)
-                ) is not None and new_steps_v <= new_steps[next_move_idx]:
-                    # Don't retrace steps
-                    # log.info(" + Already visited")
-                    continue
-
-                # Looks like a valid destination
-                # Did we acquire another key?
-                if (new_key := keys.get(n)) is not None:
-                    new_acquired_keys = acquired_keys | {new_key}
-                    # log.info(" + Unlocked %s", new_key)
-                else:
-                    new_acquired_keys = acquired_keys
-
-                queue.append(
-                    (
-                        new_total_steps,
-                        next_move_idx,
-                        new_steps,
-                        new_pts,
-                        new_acquired_keys,
+                n_state = robot_cleared | key << shift | 1 << key
+                n_steps = steps + key_steps
+                if n_steps < best.get(n_state, n_steps + 1):
+                    best[n_state] = n_steps
+                    heapq.heappush(
+                        queue,
+                        (n_steps + steps_left_at_least(n_state), n_steps, n_state),
                     )
-                )
     return -1
+
+
+def part_one(lines: Iterable[str]) -> int:
+    return collect_keys(*parse(lines, split_start=False))
+
+
+def part_two(lines: Iterable[str]) -> int:
+    return collect_keys(*parse(lines, split_start=True))
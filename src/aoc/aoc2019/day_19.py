@@ -2,6 +2,8 @@
 """
 PART 1
 Run an intcode program for input x,y coords in the range 0–49,0–49
+Rather than probing every point, follow the beam's left and right edges
+down row by row.
 
 PART 2
 Find the lowest top-left corner of a 100x100 square that fits entirely within
@@ -9,8 +11,10 @@ the beam
 """
 import logging
 from collections.abc import Iterable
+from typing import Optional
 
 from aoc.aoc2019.intcode import Intcode
+from aoc.util import Pt
 
 
 PART_ONE_EXAMPLE = """\
@@ -24,69 +28,98 @@ PART_TWO_RESULT = 18651593
 
 log = logging.getLogger(__name__)
 
-
-def part_one(lines: Iterable[str]) -> int:
-    program = [int(i) for i in "".join(lines).split(",")]
-
-    def test(x: int, y: int) -> int:
-        ic = Intcode(program)
-        ic.run(x)
-        ic.run(y)
-        return ic.outputs[0]
-
-    size = 50
-
-    edges = {0: (0, 0)}
-    xmin, xmax, y = 6, 6, 5
-    while True:
-
-        if y >= size:
-            break
-
-        # Find left edge
-        while test(xmin, y) == 0:
-            xmin += 1
-
-        # Find right edge
-        xmax += 1
-        while xmax < size and test(xmax, y) == 1:
-            xmax += 1
-        xmax -= 1
-
-        edges[y] = (xmin, xmax)
-
-        y += 1
-
+# Past the first few rows the beam is never further right than this,
+# so a row with nothing pulled within it is a row the beam misses
+MAX_SLOPE = 4
+
+
+class TractorBeam:
+    """Probe the beam with the drone program.
+
+    Every probe is cached by (x, y). The beam is a wedge from the origin,
+    so its left and right edges only ever move right as y grows.
+    We track the two edges down row by row, which takes a few probes per row
+    rather than probing every point."""
+
+    def __init__(self, program: Iterable[int]):
+        # The program sets itself up before asking for input,
+        # so do that once and fork the paused machine for each probe
+        self.drone = Intcode(program)
+        self.drone.run()
+        self.probes: dict[Pt, bool] = {}
+        self.rows: list[Optional[tuple[int, int]]] = []
+        self.last_edges = (0, 0)
+        self.instructions_run = 0
+
+    def probe(self, x: int, y: int) -> bool:
+        if (pulled := self.probes.get((x, y))) is None:
+            ic = self.drone.fork()
+            ic.run(x)
+            ic.run(y)
+            pulled = self.probes[(x, y)] = ic.outputs[0] == 1
+            self.instructions_run += ic.instructions_run - self.drone.instructions_run
+        return pulled
+
+    def row(self, y: int) -> Optional[tuple[int, int]]:
+        """Leftmost and rightmost x pulled in row y, or None if the beam misses it"""
+        while len(self.rows) <= y:
+            self.rows.append(self._track_edges(len(self.rows)))
+        return self.rows[y]
+
+    def _track_edges(self, y: int) -> Optional[tuple[int, int]]:
+        """Find the edges in row y, starting from the edges in the last row
+        the beam hit"""
+        left, right = self.last_edges
+        while not self.probe(left, y):
+            left += 1
+            if left > MAX_SLOPE * y:
+                return None
+
+        # The right edge is at least where it was last row
+        right = max(left, right)
+        while self.probe(right + 1, y):
+            right += 1
+
+        self.last_edges = (left, right)
+        return self.last_edges
+
+
+def parse(lines: Iterable[str]) -> tuple[int, ...]:
+    return tuple(int(i) for i in "".join(lines).split(","))
+
+
+def count_pulled(beam: TractorBeam, size: int = 50) -> int:
+    """Points pulled in the size x size square at the origin"""
     total = 0
     for y in range(size):
-        xmin, xmax = edges.get(y, (-1, -1))
-        log.info("".join("#" if xmin <= x <= xmax else "." for x in range(size)))
-        total += sum(1 for x in range(size) if xmin <= x <= xmax)
-
+        if (edges := beam.row(y)) is None:
+            continue
+        left, right = edges
+        total += max(0, min(right, size - 1) - left + 1)
+        log.debug("".join("#" if left <= x <= right else "." for x in range(size)))
     return total
 
 
-def part_two(lines: Iterable[str]) -> int:
-    program = [int(i) for i in "".join(lines).split(",")]
-
-    def test(x: int, y: int) -> int:
-        ic = Intcode(program)
-        ic.run(x)
-        ic.run(y)
-        return ic.outputs[0]
-
-    size = 100
-    x, y = 6, 5
+def find_square(beam: TractorBeam, size: int = 100) -> int:
+    """10000 x + y of the top left corner of the nearest size x size square
+    that fits in the beam"""
+    # Walk the bottom left corner of the square down the beam's left edge
+    # until the top right corner is in the beam too.
+    # Only the left edge matters here, so don't track the right. The left
+    # edge only moves right, so start from the last row the beam tracked.
+    y = size - 1
+    x = beam.last_edges[0]
     while True:
-
-        # Find next left edge (x, y)
-        while test(x, y) == 0:
+        while not beam.probe(x, y):
             x += 1
+        if beam.probe(x + size - 1, y - size + 1):
+            return 10_000 * x + y - size + 1
+        y += 1
 
-        # Check if we can make a square
-        y_sq = y - (size - 1)
-        if test(x + size - 1, y_sq) == 1:
-            # log.info("Found square: (%d, %d)", x, y_sq)
-            return 10_000 * x + y_sq
 
-        y += 1
+def part_one(lines: Iterable[str]) -> int:
+    return count_pulled(TractorBeam(parse(lines)))
+
+
+def part_two(lines: Iterable[str]) -> int:
+    return find_square(TractorBeam(parse(lines)))
@@ -1,23 +1,39 @@
+import itertools
 import logging
-from collections import defaultdict
-from typing import Iterable
+from collections import defaultdict, deque
+from collections.abc import Iterable, MutableSequence, Sequence
+from dataclasses import dataclass
 
 
 log = logging.getLogger(__name__)
 is_debug = log.isEnabledFor(logging.DEBUG)
 
 
-class Intcode:
+class ReferenceIntcode:
+    """Straightforward Intcode interpreter
+
+    Decodes each instruction as it goes and logs every step.
+    Slow, but easy to follow. Kept around to check the fast engine against."""
+
     mem: dict[int, int]
     pointer: int = 0
-    outputs: list[int]
+    inputs: deque[int]
+    outputs: MutableSequence[int]
     is_halted: bool = False
+    is_waiting: bool = False
     relative_base: int = 0
-
-    def __init__(self, program: Iterable[int]):
+    instructions_run: int = 0
+
+    def __init__(
+        self,
+        program: Iterable[int],
+        inputs: deque[int] | None = None,
+        outputs: MutableSequence[int] | None = None,
+    ):
         self.mem = defaultdict(int)
         self.mem.update(enumerate(program))
-        self.outputs = []
+        self.inputs = deque() if inputs is None else inputs
+        self.outputs = [] if outputs is None else outputs
 
     @property
     def memory(self) -> list[int]:
@@ -28,6 +44,18 @@ class Intcode:
             memory[i] = val
         return memory
 
+    def fork(self) -> "ReferenceIntcode":
+        """Independent copy of this machine that carries on from where it paused"""
+        ic = ReferenceIntcode((), inputs=self.inputs.copy())
+        ic.mem = self.mem.copy()
+        ic.outputs = list(self.outputs)
+        ic.pointer = self.pointer
+        ic.relative_base = self.relative_base
+        ic.is_halted = self.is_halted
+        ic.is_waiting = self.is_waiting
+        ic.instructions_run = self.instructions_run
+        return ic
+
     def operand(self, value: int, mode: int):
         if mode == 1:
             result = value
@@ -47,10 +75,14 @@ class Intcode:
         return mem_pointer
 
     def run(self, input_: int | None = None) -> None:
+        if input_ is not None:
+            self.inputs.append(input_)
+        self.is_waiting = False
         while not self.is_halted:
             instruction = self.mem[self.pointer]
             param_modes, opcode = divmod(instruction, 100)
             log.debug("--- Instruction %d ---", instruction)
+            self.instructions_run += 1
 
             if opcode == 1:
                 """Add"""
@@ -95,12 +127,15 @@ class Intcode:
 
                 mem_pointer = self.mem_pointer(p1, p1_mode)
 
-                if input_ is None:
+                if not self.inputs:
                     log.debug("OC%d No input available. Pausing.", opcode)
+                    self.is_waiting = True
+                    # This instruction runs again when there is input
+                    self.instructions_run -= 1
                     break
+                input_ = self.inputs.popleft()
                 self.mem[mem_pointer] = input_
                 log.debug("OC%d Storing %d to %d", opcode, input_, mem_pointer)
-                input_ = None
                 self.pointer += 2
             elif opcode == 4:
                 """Output"""
@@ -198,32 +233,279 @@ class Intcode:
                 self.is_halted = True
 
 
+# Number of parameters taken by each opcode
+NUM_PARAMS = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
+
+
+def _build_decode_table() -> dict[int, tuple[int, int, int, int]]:
+    """Map every valid instruction value to (opcode, mode1, mode2, mode3)
+
+    Parameters an opcode doesn't take must have mode 0.
+    Anything else is an invalid instruction and isn't in the table."""
+    table = {}
+    for opcode, num_params in NUM_PARAMS.items():
+        for modes in itertools.product(range(3), repeat=num_params):
+            m1, m2, m3 = (*modes, 0, 0, 0)[:3]
+            instruction = opcode + 100 * m1 + 1000 * m2 + 10000 * m3
+            table[instruction] = (opcode, m1, m2, m3)
+    return table
+
+
+DECODE = _build_decode_table()
+
+
+@dataclass(frozen=True)
+class IntcodeState:
+    """Everything needed to pick a paused Intcode machine back up"""
+
+    mem: tuple[int, ...]
+    pointer: int
+    relative_base: int
+    inputs: tuple[int, ...]
+    outputs: tuple[int, ...]
+    is_halted: bool
+    is_waiting: bool
+
+
+class Intcode:
+    """Fast Intcode interpreter
+
+    Same interface as ReferenceIntcode, but memory is a flat list
+    that grows on demand, instructions are decoded with a table lookup,
+    and nothing is logged unless trace=True.
+    instructions_run counts every instruction executed, across runs.
+
+    Input instructions read from the inputs queue, and output instructions
+    append to outputs. Pass in another machine's inputs as outputs to
+    connect the two; see run_round_robin."""
+
+    mem: list[int]
+    pointer: int = 0
+    inputs: deque[int]
+    outputs: MutableSequence[int]
+    is_halted: bool = False
+    is_waiting: bool = False
+    relative_base: int = 0
+    trace: bool = False
+    instructions_run: int = 0
+
+    def __init__(
+        self,
+        program: Iterable[int],
+        trace: bool = False,
+        inputs: deque[int] | None = None,
+        outputs: MutableSequence[int] | None = None,
+    ):
+        self.mem = list(program)
+        self.inputs = deque() if inputs is None else inputs
+        self.outputs = [] if outputs is None else outputs
+        self.trace = trace
+
+    @property
+    def memory(self) -> list[int]:
+        return list(self.mem)
+
+    def snapshot(self) -> IntcodeState:
+        """Copy the machine's state. Restore it with from_snapshot."""
+        return IntcodeState(
+            tuple(self.mem),
+            self.pointer,
+            self.relative_base,
+            tuple(self.inputs),
+            tuple(self.outputs),
+            self.is_halted,
+            self.is_waiting,
+        )
+
+    @classmethod
+    def from_snapshot(cls, state: IntcodeState, trace: bool = False) -> "Intcode":
+        ic = cls(state.mem, trace=trace, inputs=deque(state.inputs))
+        ic.pointer = state.pointer
+        ic.relative_base = state.relative_base
+        ic.outputs = list(state.outputs)
+        ic.is_halted = state.is_halted
+        ic.is_waiting = state.is_waiting
+        return ic
+
+    def fork(self) -> "Intcode":
+        """Independent copy of this machine that carries on from where it paused
+
+        The copy gets its own copies of the input and output queues,
+        so it is not connected to anything the original was connected to."""
+        ic = Intcode.__new__(type(self))
+        ic.mem = self.mem.copy()
+        ic.inputs = self.inputs.copy()
+        ic.outputs = self.outputs.copy()
+        ic.pointer = self.pointer
+        ic.relative_base = self.relative_base
+        ic.is_halted = self.is_halted
+        ic.is_waiting = self.is_waiting
+        ic.trace = self.trace
+        ic.instructions_run = self.instructions_run
+        return ic
+
+    def run(self, input_: int | None = None) -> None:
+        """Run until the program halts or needs input that isn't there yet
+
+        If input_ is given it is added to the inputs queue first."""
+        if input_ is not None:
+            self.inputs.append(input_)
+        if self.is_halted:
+            return
+        self.is_waiting = False
+
+        mem = self.mem
+        inputs = self.inputs
+        outputs = self.outputs
+        decode = DECODE
+        trace = self.trace
+        ip = self.pointer
+        rb = self.relative_base
+        count = 0
+
+        while True:
+            # Every instruction does all its memory accesses before changing
+            # any state. So if one falls off the end of memory we can grow
+            # memory and start the same instruction over.
+            try:
+                while True:
+                    op, m1, m2, m3 = decode[mem[ip]]
+                    count += 1
+                    if trace:
+                        log.debug(
+                            "%d: %s", ip, mem[ip : ip + 1 + NUM_PARAMS.get(op, 0)]
+                        )
+
+                    if op == 1 or op == 2 or op == 7 or op == 8:
+                        a = mem[ip + 1]
+                        if m1 == 0:
+                            a = mem[a]
+                        elif m1 == 2:
+                            a = mem[rb + a]
+                        b = mem[ip + 2]
+                        if m2 == 0:
+                            b = mem[b]
+                        elif m2 == 2:
+                            b = mem[rb + b]
+                        dest = mem[ip + 3]
+                        if m3 == 2:
+                            dest += rb
+
+                        if op == 1:
+                            mem[dest] = a + b
+                        elif op == 2:
+                            mem[dest] = a * b
+                        elif op == 7:
+                            mem[dest] = int(a < b)
+                        else:
+                            mem[dest] = int(a == b)
+                        ip += 4
+                    elif op == 5 or op == 6:
+                        a = mem[ip + 1]
+                        if m1 == 0:
+                            a = mem[a]
+                        elif m1 == 2:
+                            a = mem[rb + a]
+                        if (a != 0) == (op == 5):
+                            b = mem[ip + 2]
+                            if m2 == 0:
+                                b = mem[b]
+                            elif m2 == 2:
+                                b = mem[rb + b]
+                            ip = b
+                        else:
+                            ip += 3
+                    elif op == 3:
+                        if not inputs:
+                            if trace:
+                                log.debug("No input available. Pausing.")
+                            self.is_waiting = True
+                            self.pointer = ip
+                            self.relative_base = rb
+                            # The paused input instruction runs again later
+                            self.instructions_run += count - 1
+                            return
+                        dest = mem[ip + 1]
+                        if m1 == 2:
+                            dest += rb
+                        mem[dest] = inputs[0]
+                        inputs.popleft()
+                        ip += 2
+                    elif op == 4:
+                        a = mem[ip + 1]
+                        if m1 == 0:
+                            a = mem[a]
+                        elif m1 == 2:
+                            a = mem[rb + a]
+                        outputs.append(a)
+                        ip += 2
+                    elif op == 9:
+                        a = mem[ip + 1]
+                        if m1 == 0:
+                            a = mem[a]
+                        elif m1 == 2:
+                            a = mem[rb + a]
+                        rb += a
+                        ip += 2
+                    else:
+                        self.is_halted = True
+                        self.pointer = ip
+                        self.relative_base = rb
+                        self.instructions_run += count
+                        return
+            except IndexError:
+                if ip >= len(mem):
+                    raise RuntimeError(f"Instruction pointer {ip} outside program")
+                mem.extend([0] * len(mem))
+                # Start the same instruction over
+                count -= 1
+            except KeyError:
+                raise RuntimeError(f"Invalid instruction {mem[ip]} at {ip}")
+
+
+def run_round_robin(machines: Sequence[Intcode | ReferenceIntcode]) -> None:
+    """Run connected machines until every one has halted or is stuck waiting
+
+    Each machine gets to run until it halts or blocks on an empty input queue,
+    then the next one gets a turn. A machine that is waiting is skipped
+    until something shows up in its input queue."""
+    while True:
+        ran = False
+        for ic in machines:
+            if ic.is_halted or (ic.is_waiting and not ic.inputs):
+                continue
+            ic.run()
+            ran = True
+        if not ran:
+            return
+
+
 def run_amplifiers(
-    program: Iterable[int], input_seq: tuple[int, ...], feedback: bool
+    program: Iterable[int],
+    input_seq: tuple[int, ...],
+    feedback: bool,
+    engine: type[Intcode] | type[ReferenceIntcode] = Intcode,
 ) -> int:
+    program = tuple(program)
     num_amplifiers = len(input_seq)
 
-    # Start all ics with the same program
-    ics = [Intcode(program) for _ in range(num_amplifiers)]
-
-    # Feed the sequence into each
-    for i, ic in zip(input_seq, ics):
-        ic.run(i)
-
+    # One channel into each amplifier, seeded with its phase setting
+    channels = [deque([phase]) for phase in input_seq]
     # Start the process by feeding 0 into the first
-    input0 = 0
-    while not ics[-1].is_halted:
-        ics[0].run(input0)
+    channels[0].append(0)
 
-        # Hook the output of one into the input of the next
-        for i in range(1, num_amplifiers):
-            ics[i].run(ics[i - 1].outputs[-1])
+    # The last amplifier either feeds back into the first or into a final output
+    final_output = channels[0] if feedback else deque()
+    ics = [
+        engine(
+            program,
+            inputs=channels[i],
+            outputs=channels[i + 1] if i + 1 < num_amplifiers else final_output,
+        )
+        for i in range(num_amplifiers)
+    ]
 
-        if feedback:
-            # Feed final output back to first and keep going
-            input0 = ics[-1].outputs[-1]
-        else:
-            break
+    run_round_robin(ics)
 
     # Final output
-    return ics[-1].outputs[-1]
+    return final_output[-1]
@@ -0,0 +1,92 @@
+"""
+Run lots of independent Intcode machines on one program across processes.
+
+Each worker process gets a copy of the program once, when it starts.
+Jobs only send over their own inputs, and results come back in input order.
+"""
+import functools
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Self
+
+from aoc.aoc2019.intcode import Intcode
+
+
+# Set in each worker process by _init_worker
+_worker_program: tuple[int, ...] = ()
+
+
+def _init_worker(program: tuple[int, ...]) -> None:
+    global _worker_program
+    _worker_program = program
+
+
+def _call_with_program[T, R](func: Callable[[tuple[int, ...], T], R], item: T) -> R:
+    return func(_worker_program, item)
+
+
+def run_with_inputs(program: Iterable[int], inputs: Iterable[int]) -> list[int]:
+    """Run a fresh machine, feeding it inputs one at a time. Return its outputs."""
+    ic = Intcode(program)
+    ic.run()
+    for input_ in inputs:
+        ic.run(input_)
+    return ic.outputs
+
+
+class IntcodeFarm:
+    """Pool of worker processes that all share one Intcode program
+
+    Use as a context manager:
+        with IntcodeFarm(program) as farm:
+            for outputs in farm.run(input_vectors):
+                ...
+    """
+
+    program: tuple[int, ...]
+    max_workers: int | None
+    chunksize: int
+    executor: ProcessPoolExecutor | None = None
+
+    def __init__(
+        self,
+        program: Iterable[int],
+        max_workers: int | None = None,
+        chunksize: int = 32,
+    ):
+        self.program = tuple(program)
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+
+    def __enter__(self) -> Self:
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.program,),
+        )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.executor is not None:
+            # Callers are free to stop reading results early
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def map[T, R](
+        self, func: Callable[[tuple[int, ...], T], R], items: Iterable[T]
+    ) -> Iterator[R]:
+        """Call func(program, item) for each item in a worker process.
+
+        func must be picklable, i.e. defined at the top level of a module.
+        Results are yielded in the same order as items."""
+        if self.executor is None:
+            raise RuntimeError("IntcodeFarm must be used as a context manager")
+        return self.executor.map(
+            functools.partial(_call_with_program, func),
+            items,
+            chunksize=self.chunksize,
+        )
+
+    def run(self, inputs_batch: Iterable[Iterable[int]]) -> Iterator[list[int]]:
+        """Run one machine per input vector, yield each machine's outputs"""
+        return self.map(run_with_inputs, (tuple(inputs) for inputs in inputs_batch))
@@ -13,11 +13,18 @@ Now instead of looking at adjacent seats, we consider sight lines in each of the
     eight directions, first visible seat wins.
 Second rule changes from 4 occupied seats to 5.
 Apply rules until nothing changes. How many occupied seats?
+
+Each seat's neighbors, adjacent or first in sight, never change.
+Find them once as an array of seat indices, then run generations
+as a NumPy gather and sum over that array.
+Stop as soon as no seat changes.
 """
 import logging
 from collections.abc import Iterable
 
-from aoc.util import Pt, neighbors, OFFSETS_WITH_DIAGS, add
+import numpy as np
+
+from aoc.util import OFFSETS_WITH_DIAGS, lines_to_grid
 
 
 PART_ONE_EXAMPLE = """\
@@ -41,84 +48,114 @@ PART_TWO_RESULT = 2131
 log = logging.getLogger(__name__)
 is_debug = log.isEnabledFor(logging.DEBUG)
 
-type Coords = set[Pt]
-
-
-def parse(lines: Iterable[str]) -> tuple[Coords, Coords, int, int]:
-    occupied, unoccupied = set(), set()
-    max_y, max_x = 0, 0
-    for y, line in enumerate(lines):
-        if y >= max_y:
-            max_y = y + 1
-        for x, c in enumerate(line):
-            if c == "L":
-                unoccupied.add((x, y))
-            if x >= max_x:
-                max_x = x + 1
-    return occupied, unoccupied, max_x, max_y
-
-
-def debug_draw(o: Coords, u: Coords, max_x: int, max_y: int) -> None:
-    if not is_debug:
-        return
-    for y in range(max_y):
-        line = "".join(
-            "#" if (pt := (x, y)) in o else "L" if pt in u else "."
-            for x in range(max_x)
+SEAT = ord("L")
+
+# Check every seat if more than one in this many changed last time
+CHECK_ALL_RATIO = 16
+
+
+def index_seats(grid: np.ndarray) -> np.ndarray:
+    """Number the seats in reading order. Everything else is -1.
+    The grid is surrounded by a border of one extra seat,
+    numbered after the others, that is never occupied."""
+    is_seat = grid == SEAT
+    num_seats = int(is_seat.sum())
+    index = np.full((grid.shape[0] + 2, grid.shape[1] + 2), num_seats, dtype=np.intp)
+    inner = index[1:-1, 1:-1]
+    inner[:] = -1
+    inner[is_seat] = np.arange(num_seats)
+    return index
+
+
+def first_seen(index: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """The first seat in direction (dx, dy) from each point.
+    Sweep the rows so the point one step along has already been found."""
+    if dy == 0:
+        return first_seen(index.T, dy, dx).T
+
+    height, width = index.shape
+    seen = np.full_like(index, index[0, 0])
+    cols = slice(1 + dx, width - 1 + dx)
+    rows = range(1, height - 1) if dy < 0 else range(height - 2, 0, -1)
+    for y in rows:
+        step = index[y + dy, cols]
+        seen[y, 1:-1] = np.where(step >= 0, step, seen[y + dy, cols])
+    return seen
+
+
+def seat_neighbors(grid: np.ndarray, line_of_sight: bool) -> np.ndarray:
+    """Array of the seat indices each seat can see, one row for each
+    of the eight directions, with the border seat where there's no seat.
+    Adjacent seats only, unless we look along lines of sight."""
+    index = index_seats(grid)
+    border_seat = index[0, 0]
+    is_seat = np.zeros_like(index, dtype=bool)
+    is_seat[1:-1, 1:-1] = grid == SEAT
+
+    neighbors = []
+    for dx, dy in OFFSETS_WITH_DIAGS:
+        if line_of_sight:
+            seen = first_seen(index, dx, dy)
+        else:
+            seen = np.roll(index, (-dy, -dx), axis=(0, 1))
+            seen[seen < 0] = border_seat
+        neighbors.append(seen[is_seat])
+    return np.stack(neighbors)
+
+
+def settle(neighbors: np.ndarray, tolerance: int) -> np.ndarray:
+    """Apply the rules until nothing changes. Which seats are occupied?
+
+    A seat can only change if it or a seat it sees changed last time.
+    Seats see one another both ways, so once only a few seats are changing
+    we only check them and the seats they see."""
+    num_seats = neighbors.shape[1]
+    all_seats = np.arange(num_seats)
+    # The extra last seat is the border, which stays empty
+    occupied = np.zeros(num_seats + 1, dtype=bool)
+    needs_check = np.zeros_like(occupied)
+    to_check = all_seats
+    last_flipped = None
+    while True:
+        if to_check is all_seats:
+            checked_neighbors = neighbors
+        else:
+            checked_neighbors = neighbors[:, to_check]
+        num_occupied_neighbors = occupied[checked_neighbors].sum(axis=0, dtype=np.uint8)
+        was_occupied = occupied[to_check]
+        now_occupied = np.where(
+            was_occupied,
+            num_occupied_neighbors < tolerance,
+            num_occupied_neighbors == 0,
         )
-        log.debug(line)
-    log.debug("-" * 5)
+        flipped = to_check[now_occupied != was_occupied]
+        if len(flipped) == 0:
+            return occupied[:num_seats]
+        if last_flipped is not None and np.array_equal(flipped, last_flipped):
+            raise ValueError("Seats never settle")
 
+        occupied[flipped] = ~occupied[flipped]
+        if is_debug:
+            log.debug("%d flipped, %d occupied", len(flipped), occupied.sum())
+        last_flipped = flipped
 
-def part_one(lines: Iterable[str]) -> int:
-    occupied, unoccupied, max_x, max_y = parse(lines)
+        if len(flipped) * CHECK_ALL_RATIO > num_seats:
+            to_check = all_seats
+        else:
+            needs_check[:] = False
+            needs_check[flipped] = True
+            needs_check[neighbors[:, flipped]] = True
+            to_check = np.flatnonzero(needs_check[:num_seats])
 
-    def apply_rules(o: Coords, u: Coords) -> tuple[Coords, Coords]:
-        # Currently unoccupied, becoming occupied
-        uo = {pt for pt in u if all(n not in o for n in neighbors(pt, diags=True))}
-        # Currently occupied, becoming occupied
-        ou = {pt for pt in o if sum(n in o for n in neighbors(pt, diags=True)) >= 4}
 
-        return o - ou | uo, u - uo | ou
+def count_settled(lines: Iterable[str], line_of_sight: bool, tolerance: int) -> int:
+    neighbors = seat_neighbors(lines_to_grid(lines), line_of_sight)
+    return int(settle(neighbors, tolerance).sum())
 
-    while (new_ou := apply_rules(occupied, unoccupied)) != (occupied, unoccupied):
-        occupied, unoccupied = new_ou
-        if is_debug:
-            debug_draw(occupied, unoccupied, max_x, max_y)
 
-    return len(occupied)
+def part_one(lines: Iterable[str]) -> int:
+    return count_settled(lines, line_of_sight=False, tolerance=4)
 
 
 def part_two(lines: Iterable[str]) -> int:
-    occupied, unoccupied, max_x, max_y = parse(lines)
-
-    def inbounds(pt: Pt) -> bool:
-        return 0 <= pt[0] < max_x and 0 <= pt[1] < max_y
-
-    def first_seat(pt: Pt, delta: Pt) -> Pt:
-        while inbounds(pt := add(pt, delta)):
-            if pt in occupied or pt in unoccupied:
-                return pt
-
-    def apply_rules(o: Coords, u: Coords) -> tuple[Coords, Coords]:
-        # Currently unoccupied, becoming occupied
-        uo = {
-            pt
-            for pt in u
-            if all(first_seat(pt, d) not in o for d in OFFSETS_WITH_DIAGS)
-        }
-        # Currently occupied, becoming occupied
-        ou = {
-            pt
-            for pt in o
-            if sum(first_seat(pt, d) in o for d in OFFSETS_WITH_DIAGS) >= 5
-        }
-
-        return o - ou | uo, u - uo | ou
-
-    while (new_ou := apply_rules(occupied, unoccupied)) != (occupied, unoccupied):
-        occupied, unoccupied = new_ou
-        if is_debug:
-            debug_draw(occupied, unoccupied, max_x, max_y)
-
-    return len(occupied)
+    return count_settled(lines, line_of_sight=True, tolerance=5)
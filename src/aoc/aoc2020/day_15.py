@@ -10,10 +10,17 @@ What is the 2020th number?
 PART 2
 What is the 30000000th number?
 
-(I'm shocked that brute force seems to work just fine here.
-It takes a while but I'm ok with that.)
+The turn each number was last spoken goes in a flat array of
+unsigned ints indexed by number. Spoken numbers are differences between
+turns, so the array only needs to be as long as the turn limit.
+If numba is installed the loop is compiled; it reads the same array
+through the buffer protocol without copying it.
 """
-from collections.abc import Iterable
+import logging
+import time
+from array import array
+from collections.abc import Callable, Iterable
+from functools import cache
 
 
 PART_ONE_EXAMPLE = """\
@@ -25,24 +32,65 @@ PART_TWO_EXAMPLE = PART_ONE_EXAMPLE
 PART_TWO_EXAMPLE_RESULT = 175594
 PART_TWO_RESULT = 10652
 
+log = logging.getLogger(__name__)
+
+type SpeakLoop = Callable[[array, int, int, int], int]
+
+# Shorter games are over before compiling the loop would pay off
+COMPILE_MIN_TURNS = 1_000_000
 
-def run(lines: Iterable[str], limit: int) -> int:
-    nums = tuple(map(int, "".join(lines).split(",")))
 
-    n = -1
-    next_spoken = -1
-    last_spoken_turns = {}
-    for i, n in enumerate(nums):
-        turn = i + 1
-        next_spoken = 0 if n not in last_spoken_turns else turn - last_spoken_turns[n]
+def speak_loop(last_spoken_turns: array, n: int, start: int, limit: int) -> int:
+    """Speak from turn start until turn limit. n is the number spoken
+    on the turn before start. Turn 0 in the array means never spoken."""
+    for turn in range(start, limit):
+        last_turn = last_spoken_turns[n]
         last_spoken_turns[n] = turn
+        if last_turn:
+            n = turn - last_turn
+        else:
+            n = 0
+    return n
+
+
+@cache
+def compiled_speak_loop() -> SpeakLoop | None:
+    """speak_loop compiled with numba, if it's installed (pip install .[fast])"""
+    try:
+        import numba
+        import numpy as np
+    except ImportError:
+        return None
+
+    jitted = numba.njit(speak_loop)
+
+    def run_compiled(last_spoken_turns: array, n: int, start: int, limit: int) -> int:
+        turns = np.frombuffer(last_spoken_turns, dtype=np.uint32)
+        return int(jitted(turns, n, start, limit))
+
+    return run_compiled
+
+
+def run(lines: Iterable[str], limit: int, loop: SpeakLoop | None = None) -> int:
+    nums = tuple(map(int, "".join(lines).split(",")))
 
-    for i in range(len(nums), limit):
-        turn = i + 1
-        n = next_spoken
-        next_spoken = 0 if n not in last_spoken_turns else turn - last_spoken_turns[n]
+    # Turns are 1-indexed, the number spoken on the last turn
+    # we've been given isn't recorded until the next turn
+    last_spoken_turns = array("I", bytes(4 * (max(limit, *nums) + 1)))
+    for turn, n in enumerate(nums[:-1], start=1):
         last_spoken_turns[n] = turn
 
+    if loop is None:
+        if limit >= COMPILE_MIN_TURNS:
+            loop = compiled_speak_loop() or speak_loop
+        else:
+            loop = speak_loop
+    start_time = time.perf_counter()
+    n = loop(last_spoken_turns, nums[-1], len(nums), limit)
+    elapsed = time.perf_counter() - start_time
+    log.debug(
+        "%d turns in %.2fs, %.0f turns/s", limit, elapsed, limit / max(elapsed, 1e-9)
+    )
     return n
 
 
@@ -8,12 +8,19 @@ Count active pts after 6 rounds.
 
 PART 2
 Now the space is 4D
+
+The space is a dense boolean NumPy array for any number of dimensions,
+one layer bigger each cycle. Neighbors are counted by summing shifted
+copies one axis at a time.
+Everything starts on the z = w = 0 plane, so the state on the other
+side of it is a mirror image. Only the non-negative half of every
+axis beyond x and y is stored.
 """
-import itertools
-from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Iterable
+
+import numpy as np
 
-from aoc.util import vadd
+from aoc.util import lines_to_grid
 
 
 PART_ONE_EXAMPLE = """\
@@ -28,72 +35,75 @@ PART_TWO_EXAMPLE_RESULT = 848
 PART_TWO_RESULT = 1180
 
 
-type Pt = tuple[int, int, int, int]
+CYCLES = 6
+ACTIVE = ord("#")
+
+# Axes 0 and 1 are y and x, the rest are mirrored at 0
+PLANE_DIMS = 2
+
+
+def parse(lines: Iterable[str], dims: int) -> np.ndarray:
+    plane = lines_to_grid(lines) == ACTIVE
+    return plane.reshape(plane.shape + (1,) * (dims - PLANE_DIMS))
 
-zero = {
-    3: (0,) * 3,
-    4: (0,) * 4,
-}
 
+def pad(active: np.ndarray) -> np.ndarray:
+    """Add one inactive layer all around, except at the mirror.
+    Beyond x and y, index 0 is the mirror plane so that side isn't padded."""
+    widths = [(1, 1)] * PLANE_DIMS + [(0, 1)] * (active.ndim - PLANE_DIMS)
+    return np.pad(active, widths)
 
-def parse(lines: Iterable[str]) -> set[Pt]:
-    return {
-        (x, y, 0, 0)
-        for y, line in enumerate(lines)
-        for x, c in enumerate(line)
-        if c == "#"
-    }
 
+def count_neighbors(active: np.ndarray) -> np.ndarray:
+    """Active cells in the 3x3x... box around every cell, including itself.
+    Sum three shifted copies along each axis in turn, so the cost
+    grows with the number of axes rather than with 3 to that power."""
+    # Pad again to give the edge cells their outside neighbors.
+    # Past the mirror, index -1 is a copy of index 1.
+    counts = np.pad(active, 1).astype(np.min_scalar_type(3**active.ndim))
+    for axis in range(PLANE_DIMS, active.ndim):
+        mirror = [slice(None)] * active.ndim
+        mirror[axis] = 0
+        source = mirror.copy()
+        source[axis] = 2
+        counts[tuple(mirror)] = counts[tuple(source)]
 
-def neighbors3(pt: Pt) -> Iterable[Pt]:
-    for delta in itertools.product((1, 0, -1), repeat=3):
-        if delta == zero[3]:
-            continue
-        add3 = vadd(pt[:3], delta)
-        yield *add3, 0
+    for axis in range(active.ndim):
+        counts = np.moveaxis(counts, axis, 0)
+        counts = counts[:-2] + counts[1:-1] + counts[2:]
+        counts = np.moveaxis(counts, 0, axis)
+    return counts
 
 
-def neighbors4(pt: Pt) -> Iterable[Pt]:
-    for delta in itertools.product((1, 0, -1), repeat=4):
-        if delta == zero[4]:
-            continue
-        yield vadd(pt, delta)
+def cycle(active: np.ndarray) -> np.ndarray:
+    active = pad(active)
+    counts = count_neighbors(active)
+    # The box count includes the cell itself
+    return (counts == 3) | (active & (counts == 4))
 
 
-def apply_rules(active: set[Pt], neighbors: Callable[[Pt], Iterable[Pt]]) -> set[Pt]:
-    new_active = set()
-    inactive_pt_active_neighbors_dict = defaultdict(int)
-    for pt in active:
-        active_pt_active_neighbors = 0
-        # Look at all neighbors of this active pt
-        for n in neighbors(pt):
-            if n in active:
-                # This active pt has an active neighbor
-                active_pt_active_neighbors += 1
-            else:
-                # This inactive n has an active neighbor pt
-                inactive_pt_active_neighbors_dict[n] += 1
-        if active_pt_active_neighbors == 2 or active_pt_active_neighbors == 3:
-            new_active.add(pt)
+def count_active(active: np.ndarray) -> int:
+    """Every cell off the mirror planes stands for itself and its mirror images"""
+    weights = active.astype(np.int64)
+    for axis in range(PLANE_DIMS, active.ndim):
+        shape = [1] * active.ndim
+        shape[axis] = active.shape[axis]
+        axis_weights = np.full(shape, 2)
+        axis_weights.flat[0] = 1
+        weights *= axis_weights
+    return int(weights.sum())
 
-    new_active.update(
-        n
-        for n, inactive_pt_active_neighbors in inactive_pt_active_neighbors_dict.items()
-        if inactive_pt_active_neighbors == 3
-    )
 
-    return new_active
+def run(lines: Iterable[str], dims: int, cycles: int = CYCLES) -> int:
+    active = parse(lines, dims)
+    for _ in range(cycles):
+        active = cycle(active)
+    return count_active(active)
 
 
 def part_one(lines: Iterable[str]) -> int:
-    active = parse(lines)
-    for _ in range(6):
-        active = apply_rules(active, neighbors3)
-    return len(active)
+    return run(lines, 3)
 
 
 def part_two(lines: Iterable[str]) -> int:
-    active = parse(lines)
-    for _ in range(6):
-        active = apply_rules(active, neighbors4)
-    return len(active)
+    return run(lines, 4)
@@ -9,12 +9,22 @@ PART 2
 Given aligned tiles from part 1, remove borders and concat into one tile.
 Find "sea monsters" based on a pattern.
 Count how many # tiles are not part of a sea monster.
+
+Each edge is read as a binary number, and the smaller of it and its
+reverse is a signature that doesn't change when the tile flips.
+One pass over the tiles indexes them by edge signature. Then each tile
+is placed by looking up the tile across its neighbor's edge.
+Sea monsters are found by ANDing shifted slices of the whole image.
 """
-import itertools
 import logging
 import math
-from collections import deque
-from collections.abc import Iterable
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+import numpy as np
+
+from aoc.util import lines_to_grid
 
 
 PART_ONE_EXAMPLE = """\
@@ -136,7 +146,7 @@ log = logging.getLogger(__name__)
 is_debug = log.isEnabledFor(logging.DEBUG)
 
 
-type Tile = tuple[str, ...]
+type Tile = np.ndarray
 
 MONSTER_DELTAS = {
     (0, 1),
@@ -155,18 +165,17 @@ MONSTER_DELTAS = {
     (18, 1),
     (19, 1),
 }
-LMD = len(MONSTER_DELTAS)
+MONSTER_WIDTH = 1 + max(x for x, _ in MONSTER_DELTAS)
+MONSTER_HEIGHT = 1 + max(y for _, y in MONSTER_DELTAS)
 
 
-def parse(lines: Iterable[str]) -> list[tuple[int, Tile]]:
-    lines = iter(lines)
-
-    tiles = []
+def parse(lines: Iterable[str]) -> dict[int, Tile]:
+    tiles = {}
     tile_id = -1
     tile_lines = []
     for line in lines:
         if line == "":
-            tiles.append((tile_id, tuple(tile_lines)))
+            tiles[tile_id] = lines_to_grid(tile_lines) == ord("#")
             tile_id = -1
             tile_lines = []
         elif tile_id == -1:
@@ -175,195 +184,159 @@ def parse(lines: Iterable[str]) -> list[tuple[int, Tile]]:
             tile_lines.append(line)
 
     if tile_lines:
-        tiles.append((tile_id, tuple(tile_lines)))
+        tiles[tile_id] = lines_to_grid(tile_lines) == ord("#")
 
     return tiles
 
 
-def rotate(tile: Tile) -> Tile:
-    lt = len(tile)
-    new_tile = [
-        "".join(tile[row_idx][-col_idx - 1] for row_idx in range(lt))
-        for col_idx in range(lt)
-    ]
-    return tuple(new_tile)
+def orientations(tile: Tile) -> Iterator[Tile]:
+    """All eight ways to rotate and flip a tile"""
+    for flipped in (tile, tile.T):
+        for rotations in range(4):
+            yield np.rot90(flipped, rotations)
 
 
-def find_neighbors(
-    tiles: dict[int, Tile]
-) -> tuple[dict[int, Tile], dict[int, dict[tuple[int, int], int]]]:
+def edges(tile: Tile) -> tuple[Tile, Tile, Tile, Tile]:
+    """Top, right, bottom, left"""
+    return tile[0], tile[:, -1], tile[-1], tile[:, 0]
 
-    def top(tile: Tile) -> str:
-        return tile[0]
 
-    def bottom(tile: Tile) -> str:
-        return tile[-1]
+def edge_signature(edge: Tile) -> int:
+    """The edge as a binary number, read whichever way round is smaller,
+    so an edge and its flip have the same signature"""
+    forward = int.from_bytes(np.packbits(edge).tobytes())
+    backward = int.from_bytes(np.packbits(edge[::-1]).tobytes())
+    return min(forward, backward)
 
-    def right(tile: Tile) -> str:
-        return "".join(t[-1] for t in tile)
 
-    def left(tile: Tile) -> str:
-        return "".join(t[0] for t in tile)
+def index_edges(tiles: dict[int, Tile]) -> dict[int, list[int]]:
+    """Which tiles have an edge with each signature"""
+    edge_index = defaultdict(list)
+    for tile_id, tile in tiles.items():
+        for edge in edges(tile):
+            edge_index[edge_signature(edge)].append(tile_id)
+    return edge_index
 
-    def match(tile1: Tile, tile2: Tile) -> tuple[Tile, tuple[int, int]]:
-        """Check tiles for match.
-        Returns
-            Tile: tile2 in matching orientation (or 0 if no match)
-            int: which neighbor of tile1 is tile2? 0=right, 1=north, 2=left, 3=south
-        """
-        tile1_top = top(tile1)
-        tile1_bottom = bottom(tile1)
-        tile1_left = left(tile1)
-        tile2_right = right(tile1)
 
-        original_tile2 = tile2
+def is_outer_edge(edge: Tile, edge_index: dict[int, list[int]]) -> bool:
+    return len(edge_index[edge_signature(edge)]) == 1
 
-        for f, tile2 in enumerate(
-            (
-                original_tile2,
-                original_tile2[::-1],
-                tuple(t[::-1] for t in original_tile2),
-            )
+
+def find_corners(tiles: dict[int, Tile], edge_index: dict[int, list[int]]) -> list[int]:
+    """Corners are the tiles with two edges that match no other tile"""
+    return [
+        tile_id
+        for tile_id, tile in tiles.items()
+        if sum(is_outer_edge(edge, edge_index) for edge in edges(tile)) == 2
+    ]
+
+
+def place_next(
+    edge: Tile,
+    side: int,
+    other_edge: Optional[Tile],
+    other_side: int,
+    from_id: int,
+    tiles: dict[int, Tile],
+    edge_index: dict[int, list[int]],
+) -> tuple[int, Tile]:
+    """Find the tile across edge from tile from_id, oriented so its
+    edge on this side (0 = top, 3 = left) matches.
+    A palindrome edge matches a flipped tile too, so its edge on other_side
+    must also match other_edge, or be an outer edge if other_edge is None."""
+    (tile_id,) = (
+        tile_id for tile_id in edge_index[edge_signature(edge)] if tile_id != from_id
+    )
+    for tile in orientations(tiles[tile_id]):
+        other = edges(tile)[other_side]
+        if np.array_equal(edges(tile)[side], edge) and (
+            is_outer_edge(other, edge_index)
+            if other_edge is None
+            else np.array_equal(other, other_edge)
         ):
+            return tile_id, tile
+    raise ValueError(f"Tile {tile_id} doesn't fit next to tile {from_id}")
+
+
+def assemble(tiles: dict[int, Tile]) -> list[list[Tile]]:
+    """Lay out the tiles in rows, each in its matching orientation.
+    Every tile after the first is one lookup across its left or top edge."""
+    edge_index = index_edges(tiles)
+    side_length = math.isqrt(len(tiles))
+
+    # Start at the top left, with its unmatched edges up and left
+    corner_id = find_corners(tiles, edge_index)[0]
+    corner = next(
+        tile
+        for tile in orientations(tiles[corner_id])
+        if is_outer_edge(edges(tile)[0], edge_index)
+        and is_outer_edge(edges(tile)[3], edge_index)
+    )
+
+    rows = []
+    row_start_id, row_start = corner_id, corner
+    for row_idx in range(side_length):
+        if row_idx > 0:
+            above_id, above = row_start_id, rows[-1][0]
+            row_start_id, row_start = place_next(
+                edges(above)[2], 0, None, 3, above_id, tiles, edge_index
+            )
+        row = [row_start]
+        tile_id, tile = row_start_id, row_start
+        for col in range(1, side_length):
+            above_edge = edges(rows[-1][col])[2] if row_idx > 0 else None
+            tile_id, tile = place_next(
+                edges(tile)[1], 3, above_edge, 0, tile_id, tiles, edge_index
+            )
+            row.append(tile)
+        rows.append(row)
+    return rows
 
-            # Try four rotations (with 0 being no rotation)
-            for r in range(4):
-                if r != 0:
-                    tile2 = rotate(tile2)
-                # Check four neighbors
-                if tile2_right == left(tile2):
-                    return tile2, (1, 0)
-                elif tile1_top == bottom(tile2):
-                    return tile2, (0, -1)
-                elif tile1_left == right(tile2):
-                    return tile2, (-1, 0)
-                elif tile1_bottom == top(tile2):
-                    return tile2, (0, 1)
-        return (), (0, 0)
-
-    neighbors = {}
-    rotated_tiles = {}
-    tile_queue = deque([])
-    while tile_queue or tiles:
-        if not tile_queue:
-            tile_queue.append(tiles.popitem())
-        t1id, t1 = tile_queue.popleft()
-
-        if t1id in rotated_tiles:
-            continue
-        rotated_tiles[t1id] = t1
-
-        t1neighbors = neighbors.get(t1id, {})
-
-        for t2id, t2 in itertools.chain(tiles.items(), rotated_tiles.items()):
-            if t2id == t1id:
-                continue
-
-            t2neighbors = neighbors.get(t2id, {})
-            if t1id in t2neighbors.values():
-                # We already know t1 is a neighbor of t2
-                continue
-
-            rotated_t2, neighb_num = match(t1, t2)
-            if neighb_num != (0, 0):
-                t1neighbors[neighb_num] = t2id
-                neighbors[t1id] = t1neighbors
-
-                # Also mark the neighbor relationship in reverse
-                t2neighbors[(-neighb_num[0], -neighb_num[1])] = t1id
-                neighbors[t2id] = t2neighbors
-
-                tile_queue.append((t2id, rotated_t2))
-
-    return rotated_tiles, neighbors
 
+def find_sea_monsters(image: Tile) -> Tile:
+    """Where in the image are the sea monsters' pixels?
+    Each pixel of the monster narrows down where monsters can start,
+    one shifted slice of the image at a time."""
+    height, width = image.shape
+    starts = np.ones(
+        (height - MONSTER_HEIGHT + 1, width - MONSTER_WIDTH + 1), dtype=bool
+    )
+    for x, y in MONSTER_DELTAS:
+        starts &= image[y : y + starts.shape[0], x : x + starts.shape[1]]
 
-def part_one(lines: Iterable[str]) -> int:
-    tiles = dict(parse(lines))
-    _, neighbors = find_neighbors(tiles)
+    monsters = np.zeros_like(image)
+    for x, y in MONSTER_DELTAS:
+        monsters[y : y + starts.shape[0], x : x + starts.shape[1]] |= starts
+    return monsters
 
-    if is_debug:
-        for tid, tneighb in neighbors.items():
-            log.debug("Tile %d neighbors %s", tid, tneighb)
 
-    return math.prod(tid for tid, tneighb in neighbors.items() if len(tneighb) == 2)
+def part_one(lines: Iterable[str]) -> int:
+    tiles = parse(lines)
+    return math.prod(find_corners(tiles, index_edges(tiles)))
 
 
 def part_two(lines: Iterable[str]) -> int:
-    tiles = dict(parse(lines))
-    rotated_tiles, neighbors = find_neighbors(tiles)
-
-    # Find all the tile positions from the neighbor relationships
-    # First, find the top-left tile
-    tid = -1
-    for tid, tneighbors in neighbors.items():
-        if tneighbors.keys() == {(0, 1), (1, 0)}:
-            break
-    original_tile = []
-    while tid != -1:
-        row = []
-        left = tid
-
-        # Find all the neighbors to the right
-        while tid != -1:
-            # Make sure we trim the border off the tile before adding it
-            row.append(tl[1:-1] for tl in rotated_tiles[tid][1:-1])
-            # Move pointer to the right
-            tid = neighbors[tid].get((1, 0), -1)
-
-        # We're at the end of a row
-        # concat all lines of tiles in the row
-        original_tile.extend("".join(row_lines) for row_lines in zip(*row))
-
-        # Continue with next leftmost tile down
-        tid = neighbors[left].get((0, 1), -1)
-    if is_debug:
-        for otline in original_tile:
-            log.debug(otline)
-
-    # Now it's time to find the sea monsters
-    max_y = len(original_tile) - 2
-    max_x = len(original_tile) - 19
-    sea_monster_top_lefts = set()
-    num_sea_monsters = 0
-
-    # Three flips: identity, top/bottom, and left/right
-    for f, tile in enumerate(
-        (original_tile, original_tile[::-1], tuple(t[::-1] for t in original_tile))
-    ):
-        # Four rotations: 0, pi/2, pi, 3pi/2
-        for r in range(4):
-            if r > 0:
-                tile = rotate(tile)
-
-            for top_y in range(max_y):
-                for left_x in range(max_x):
-                    if all(
-                        tile[top_y + y][left_x + x] == "#" for x, y in MONSTER_DELTAS
-                    ):
-                        num_sea_monsters += 1
-                        sea_monster_top_lefts.add((left_x, top_y))
-
-            if num_sea_monsters:
-                break
-        if num_sea_monsters:
+    tiles = parse(lines)
+    rows = assemble(tiles)
+
+    # Trim the borders off the tiles and join them into one image
+    image = np.block([[tile[1:-1, 1:-1] for tile in row] for row in rows])
+
+    # Only one orientation of the image has any sea monsters in it
+    for oriented in orientations(image):
+        monsters = find_sea_monsters(oriented)
+        if monsters.any():
             break
-    if not num_sea_monsters:
+    else:
         return -1
 
     if is_debug:
-        log.debug("flip %d rotation %d", f, r)
-        log.debug("top left pts: %s", sea_monster_top_lefts)
-        sea_monsters = {
-            (left_x + x, top_y + y)
-            for left_x, top_y in sea_monster_top_lefts
-            for x, y in MONSTER_DELTAS
-        }
-        for y, line in enumerate(tile):
+        for image_row, monster_row in zip(oriented, monsters):
             log.debug(
                 "".join(
-                    "O" if (x, y) in sea_monsters else c for x, c in enumerate(line)
+                    "O" if monster else "#" if pixel else "."
+                    for pixel, monster in zip(image_row, monster_row)
                 )
             )
 
-    return sum(c == "#" for line in tile for c in line) - LMD * num_sea_monsters
+    return int((oriented & ~monsters).sum())
@@ -11,6 +11,11 @@ Round proceeds as before, compare top cards.
 If both players decks have at least as many cards as the number they just drew,
     recursively play a new game.
 Otherwise (one player doesn't have enough cards) high card wins the round.
+
+Decks are bytes, one card per byte, so they are cheap to hash and slice.
+Sub-game winners are cached by their starting decks. If player 1 holds
+the highest card in a sub-game, and it is too high to start a sub-game
+of its own, player 1 wins without playing.
 """
 import logging
 from collections import deque
@@ -71,51 +76,76 @@ def part_one(lines: Iterable[str]) -> int:
         else:
             player2.extend((top2, top1))
 
-    winner = player1 if player1 else player2
-    return sum(card * (i + 1) for i, card in enumerate(reversed(winner)))
+    return score(player1 if player1 else player2)
 
 
-def part_two(lines: Iterable[str]) -> int:
+def score(deck: Iterable[int]) -> int:
+    return sum(card * (i + 1) for i, card in enumerate(reversed(list(deck))))
+
 
-    def game(deck1: deque[int], deck2: deque[int]) -> tuple[bool, deque[int]]:
-        round_cache = set()
+class RecursiveCombat:
+    """Plays games of recursive combat, keeping count of the rounds
+    and sub-games played and remembering who won each sub-game"""
+
+    def __init__(self):
+        self.winners: dict[tuple[bytes, bytes], bool] = {}
+        self.rounds = 0
+        self.sub_games = 0
+
+    def play(self, deck1: bytes, deck2: bytes) -> tuple[bool, bytes]:
+        """Play a game to the end. Does player 1 win, and with what deck?"""
+        seen_rounds = set()
         while deck1 and deck2:
-            log.debug("Player 1's deck: %s", deck1)
-            log.debug("Player 2's deck: %s", deck2)
             # Check if we have played this round before
-            round_ = tuple(deck1), tuple(deck2)
-            if round_ in round_cache:
+            round_ = deck1, deck2
+            if round_ in seen_rounds:
                 return True, deck1
-            round_cache.add(round_)
+            seen_rounds.add(round_)
+            self.rounds += 1
 
             # Pull cards
-            top1 = deck1.popleft()
-            top2 = deck2.popleft()
-            log.debug("Player 1 plays: %d", top1)
-            log.debug("Player 2 plays: %d", top2)
+            top1, top2 = deck1[0], deck2[0]
+            deck1, deck2 = deck1[1:], deck2[1:]
 
             if len(deck1) >= top1 and len(deck2) >= top2:
-                # Play recursive game
-                log.debug("Playing recursive game")
-                player1_wins_round, _ = game(
-                    deque(list(deck1)[:top1]), deque(list(deck2)[:top2])
-                )
+                player1_wins_round = self.sub_game(deck1[:top1], deck2[:top2])
             else:
                 # Compare cards
                 player1_wins_round = top1 > top2
 
             if player1_wins_round:
-                log.debug("Player 1 wins round")
-                deck1.extend((top1, top2))
+                deck1 += bytes((top1, top2))
             else:
-                log.debug("Player 2 wins round")
-                deck2.extend((top2, top1))
+                deck2 += bytes((top2, top1))
+
         # Game over
-        player1_wins_game = bool(deck1)
-        log.debug("Player %d wins game", 1 if player1_wins_game else 2)
-        return player1_wins_game, deck1 if player1_wins_game else deck2
+        return (True, deck1) if deck1 else (False, deck2)
 
+    def sub_game(self, deck1: bytes, deck2: bytes) -> bool:
+        """Does player 1 win this sub-game?
+
+        If player 1 has the highest card, it is too high to start another
+        sub-game, as that needs more cards than there are left in play.
+        So it wins every round it's played in and player 1 never runs out.
+        Either player 2 runs out or the rounds repeat, and player 1 wins."""
+        if max(deck1) > max(deck2) and max(deck1) > len(deck1) + len(deck2) - 2:
+            return True
+
+        decks = deck1, deck2
+        if decks not in self.winners:
+            self.sub_games += 1
+            self.winners[decks], _ = self.play(deck1, deck2)
+        return self.winners[decks]
+
+
+def part_two(lines: Iterable[str]) -> int:
     player1, player2 = parse(lines)
-    _, winning_deck = game(player1, player2)
-    log.debug("Winning deck %s", winning_deck)
-    return sum(card * (i + 1) for i, card in enumerate(reversed(winning_deck)))
+    combat = RecursiveCombat()
+    player1_wins, winning_deck = combat.play(bytes(player1), bytes(player2))
+    log.debug(
+        "Player %d wins after %d rounds and %d sub-games",
+        1 if player1_wins else 2,
+        combat.rounds,
+        combat.sub_games,
+    )
+    return score(winning_deck)
@@ -9,7 +9,9 @@ up to 1 million.
 And we need to do 10 million moves, not just 100.
 Multiply the two values clockwise of 1.
 """
-from collections.abc import Iterable
+import logging
+from array import array
+from collections.abc import Iterable, Iterator
 
 
 PART_ONE_EXAMPLE = """\
@@ -21,77 +23,85 @@ PART_TWO_EXAMPLE = PART_ONE_EXAMPLE
 PART_TWO_EXAMPLE_RESULT = 149245887792
 PART_TWO_RESULT = 286194102744
 
-# log = logging.getLogger(__name__)
-# is_debug = log.isEnabledFor(logging.DEBUG)
-
-
-def do_moves_but_fast_this_time(given_nums: list[int], moves: int) -> dict[int, int]:
-    max_val = max(given_nums)
-
-    # Each num points to the next num
-    num_pointers = dict(zip(given_nums, given_nums[1:] + [given_nums[0]]))
-    active = given_nums[0]
-
-    for _ in range(moves):
-        # if is_debug:
-        #     log.debug("-- move %d --", m + 1)
-        #     the_rest = []
-        #     next_num = active
-        #     while (next_num := num_pointers[next_num]) != active:
-        #         the_rest.append(next_num)
-        #     log.debug("cups: (%d) %s", active, " ".join(map(str, the_rest)))
-
-        # "Pick up" three next to active
-        hold = [num_pointers[active]]
-        hold.append(num_pointers[hold[-1]])
-        hold.append(num_pointers[hold[-1]])
-        # if is_debug:
-        #     log.debug("pick up: %s", " ".join(map(str, hold)))
-
-        # Bridge the gap we made by picking these up
-        num_pointers[active] = num_pointers[hold[-1]]
-
-        # Find dest number
-        dest = (active - 1) % max_val
-        if dest == 0:
-            dest = max_val
-        while dest in hold:
-            dest = (dest - 1) % max_val
-            if dest == 0:
-                dest = max_val
-        # log.debug("destination: %d", dest)
-
-        # Re-insert held items
-        num_pointers[hold[-1]] = num_pointers[dest]
-        num_pointers[dest] = hold[0]
-
-        # Move active to next in the chain
-        active = num_pointers[active]
-
-        # log.debug("")
-    return num_pointers
+log = logging.getLogger(__name__)
+
+CHUNK_MOVES = 1_000_000
+
+
+class CupGame:
+    """The circle of cups as a successor array: the cup clockwise of
+    cup n is next_cup[n]. Moves only rewrite a few entries, so nothing
+    is allocated while playing, and a million cups take about 4 MB.
+
+    Moves run in chunks. The game can be stopped between chunks to report
+    progress or to pickle it, and running it again carries on from there."""
+
+    def __init__(self, cups: list[int]):
+        self.max_cup = max(cups)
+        # Index 0 isn't a cup
+        self.next_cup = array("i", bytes(4 * (self.max_cup + 1)))
+        for cup, next_cup in zip(cups, cups[1:] + cups[:1]):
+            self.next_cup[cup] = next_cup
+        self.current = cups[0]
+        self.moves_done = 0
+
+    def run(self, moves: int, chunk: int = CHUNK_MOVES) -> Iterator[int]:
+        """Make this many more moves. Yields the total moves made so far
+        after each chunk."""
+        end = self.moves_done + moves
+        while self.moves_done < end:
+            chunk_moves = min(chunk, end - self.moves_done)
+            self.current = self._move(self.current, chunk_moves)
+            self.moves_done += chunk_moves
+            yield self.moves_done
+
+    def play(self, moves: int) -> None:
+        for moves_done in self.run(moves):
+            log.debug("%d moves done", moves_done)
+
+    def _move(self, current: int, moves: int) -> int:
+        next_cup = self.next_cup
+        max_cup = self.max_cup
+        for _ in range(moves):
+            # "Pick up" three next to current
+            held1 = next_cup[current]
+            held2 = next_cup[held1]
+            held3 = next_cup[held2]
+
+            # Bridge the gap we made by picking these up
+            next_cup[current] = next_cup[held3]
+
+            # Find destination, the next lowest cup we aren't holding
+            dest = current - 1 or max_cup
+            while dest == held1 or dest == held2 or dest == held3:
+                dest = dest - 1 or max_cup
+
+            # Re-insert held cups after the destination
+            next_cup[held3] = next_cup[dest]
+            next_cup[dest] = held1
+
+            current = next_cup[current]
+        return current
+
+    def clockwise_of(self, cup: int) -> Iterator[int]:
+        """Cups going clockwise from this one, not including it"""
+        next_cup = self.next_cup[cup]
+        while next_cup != cup:
+            yield next_cup
+            next_cup = self.next_cup[next_cup]
 
 
 def part_one(lines: Iterable[str]) -> str:
-    given_nums = [int(c) for c in "".join(lines)]
-
-    pointers = do_moves_but_fast_this_time(given_nums, 100)
-
-    num = 1
-    ordered = []
-    for _ in range(len(pointers) - 1):
-        next_num = pointers[num]
-        ordered.append(next_num)
-        num = next_num
-
-    return "".join(map(str, ordered))
+    game = CupGame([int(c) for c in "".join(lines)])
+    game.play(100)
+    return "".join(map(str, game.clockwise_of(1)))
 
 
 def part_two(lines: Iterable[str]) -> int:
     given_nums = [int(c) for c in "".join(lines)]
-    all_nums = given_nums + list(range(9 + 1, 1_000_001))
-    pointers = do_moves_but_fast_this_time(all_nums, 10_000_000)
+    game = CupGame(given_nums + list(range(max(given_nums) + 1, 1_000_001)))
+    game.play(10_000_000)
 
-    num1 = pointers[1]
-    num2 = pointers[num1]
-    return num1 * num2
+    cup1 = game.next_cup[1]
+    cup2 = game.next_cup[cup1]
+    return cup1 * cup2
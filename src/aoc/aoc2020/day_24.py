@@ -10,10 +10,17 @@ Start with the setup from part 1, then follow the rule:
 How many black tiles after 100 iterations?
 
 (This is basically just like 2020 day 17.)
+
+All the directions are read at once with NumPy. Tiles live in a 2D
+array indexed by axial coordinates, with an empty margin that grows
+when the black tiles get close to the edge. The number of black
+neighbors is a sum of six shifted slices.
 """
-from collections import Counter, defaultdict
+import logging
 from collections.abc import Iterable
 
+import numpy as np
+
 
 PART_ONE_EXAMPLE = """\
 sesenwnenenewseeswwswswwnenewsewsw
@@ -44,61 +51,95 @@ PART_TWO_EXAMPLE_RESULT = 2208
 PART_TWO_RESULT = 4118
 
 
-# See https://www.redblobgames.com/grids/hexagons/#coordinates-axial
-type AxialHexVec = tuple[int, int]
-
-
-def neighbors(tile: AxialHexVec) -> Iterable[AxialHexVec]:
-    for offset in (1, -1):
-        yield tile[0], tile[1] + offset
-        yield tile[0] + offset, tile[1]
-        yield tile[0] + offset, tile[1] - offset
-
+log = logging.getLogger(__name__)
 
-def parse(line: str) -> AxialHexVec:
-    hexvecdict = {"q": 0, "r": 0}
-    lline = len(line)
-    i = 0
-    while i < lline:
-        if line[i] in "ew":
-            hexvecdict["q"] += 1 if line[i] == "e" else -1
-            i -= 1
-        elif line[i : i + 2] in {"nw", "se"}:
-            hexvecdict["r"] += 1 if line[i + 1] == "e" else -1
-        else:
-            offset = 1 if line[i + 1] == "e" else -1
-            hexvecdict["q"] += offset
-            hexvecdict["r"] -= offset
+DAYS = 100
 
-        i += 2
+# How far the grid grows on each side when black tiles reach its edge
+GROW_MARGIN = 16
 
-    return hexvecdict["q"], hexvecdict["r"]
 
+def parse(lines: Iterable[str]) -> np.ndarray:
+    """Axial coordinates (q, r) of the tile each line of directions leads to.
+    See https://www.redblobgames.com/grids/hexagons/#coordinates-axial
 
-def find_black_tiles(lines: Iterable[str]) -> set[AxialHexVec]:
-    visited = Counter(parse(line) for line in lines)
-    return {tile for tile, times_visited in visited.items() if times_visited % 2}
-
-
-def apply_rules(black_tiles: set[AxialHexVec]) -> set[AxialHexVec]:
-    new_black_tiles = set()
-    white_tiles_black_neighbors = defaultdict(int)
-    for black_tile in black_tiles:
-        black_tile_black_neighbors = 0
-        for n in neighbors(black_tile):
-            if n in black_tiles:
-                black_tile_black_neighbors += 1
-            else:
-                white_tiles_black_neighbors[n] += 1
-        if black_tile_black_neighbors == 1 or black_tile_black_neighbors == 2:
-            new_black_tiles.add(black_tile)
-
-    new_black_tiles.update(
-        white_tile
-        for white_tile, num_black_neighbors in white_tiles_black_neighbors.items()
-        if num_black_neighbors == 2
+    Every n or s moves one row, r. Every e or w moves one column, q,
+    except the e in se and the w in nw."""
+    text = np.frombuffer(("\n".join(lines) + "\n").encode(), dtype=np.uint8)
+    after_n = np.roll(text == ord("n"), 1)
+    after_s = np.roll(text == ord("s"), 1)
+    dr = (text == ord("s")).astype(np.int64) - (text == ord("n"))
+    dq = ((text == ord("e")) & ~after_s).astype(np.int64) - (
+        (text == ord("w")) & ~after_n
     )
-    return new_black_tiles
+
+    # Which line each character is on
+    line_ids = np.cumsum(text == ord("\n")) - (text == ord("\n"))
+    num_lines = int(line_ids[-1]) + 1
+    q = np.bincount(line_ids, weights=dq, minlength=num_lines)
+    r = np.bincount(line_ids, weights=dr, minlength=num_lines)
+    return np.stack((q, r), axis=1).astype(np.int64)
+
+
+def find_black_tiles(lines: Iterable[str]) -> np.ndarray:
+    """Tiles flipped an odd number of times, one (q, r) row per tile"""
+    tiles, times_flipped = np.unique(parse(lines), axis=0, return_counts=True)
+    return tiles[times_flipped % 2 == 1]
+
+
+class HexLife:
+    """Black tiles on a hex grid, stored as a 2D boolean array indexed by
+    axial coordinates [r, q] shifted by an offset. The outer two layers
+    are kept white, so a day never needs anything from off the grid."""
+
+    def __init__(self, black_tiles: np.ndarray):
+        low = black_tiles.min(axis=0, initial=0)
+        high = black_tiles.max(axis=0, initial=0)
+        q_size, r_size = high - low + 1
+        self.q_offset, self.r_offset = GROW_MARGIN - low
+        self.black = np.zeros(
+            (r_size + 2 * GROW_MARGIN, q_size + 2 * GROW_MARGIN), dtype=bool
+        )
+        self.black[
+            black_tiles[:, 1] + self.r_offset, black_tiles[:, 0] + self.q_offset
+        ] = True
+
+    def near_edge(self) -> bool:
+        black = self.black
+        return bool(
+            black[:2].any()
+            or black[-2:].any()
+            or black[:, :2].any()
+            or black[:, -2:].any()
+        )
+
+    def grow(self) -> None:
+        self.black = np.pad(self.black, GROW_MARGIN)
+        self.q_offset += GROW_MARGIN
+        self.r_offset += GROW_MARGIN
+        log.debug("Grew grid to %s", self.black.shape)
+
+    def count_black_neighbors(self) -> np.ndarray:
+        """Black neighbors of every tile except those on the edge.
+        The neighbors of [r, q] are [r, q ± 1], [r ± 1, q],
+        [r - 1, q + 1] and [r + 1, q - 1]."""
+        black = self.black.view(np.uint8)
+        counts = black[1:-1, :-2] + black[1:-1, 2:]
+        counts += black[:-2, 1:-1]
+        counts += black[2:, 1:-1]
+        counts += black[:-2, 2:]
+        counts += black[2:, :-2]
+        return counts
+
+    def step(self) -> None:
+        if self.near_edge():
+            self.grow()
+        counts = self.count_black_neighbors()
+        inner = self.black[1:-1, 1:-1]
+        self.black[1:-1, 1:-1] = (counts == 2) | (inner & (counts == 1))
+
+    def num_black(self) -> int:
+        return int(self.black.sum())
 
 
 def part_one(lines: Iterable[str]) -> int:
@@ -106,8 +147,7 @@ def part_one(lines: Iterable[str]) -> int:
 
 
 def part_two(lines: Iterable[str]) -> int:
-    black_tiles = find_black_tiles(lines)
-
-    for d in range(100):
-        black_tiles = apply_rules(black_tiles)
-    return len(black_tiles)
+    tiles = HexLife(find_black_tiles(lines))
+    for _ in range(DAYS):
+        tiles.step()
+    return tiles.num_black()
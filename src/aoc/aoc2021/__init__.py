@@ -1,13 +1,14 @@
 import importlib
 import logging
 
-import pyperclip
-
-from typing import Iterable, Optional, Protocol, cast
+from typing import TYPE_CHECKING, Iterable, Optional, Protocol, cast
 
 import aoc.util
 from aoc.util import Part, result_output_str
 
+if TYPE_CHECKING:
+    from aoc.profiling import Profiler
+
 
 log = logging.getLogger(__package__)
 
@@ -34,7 +35,9 @@ def get_input_file_lines(day: str | int) -> Iterable[str]:
     return aoc.util.get_input_file_lines(YEAR, day)
 
 
-def run_puzzle_func(day: str | int, part: Part) -> bool:
+def run_puzzle_func(
+    day: str | int, part: Part, profiler: Optional["Profiler"] = None
+) -> bool:
     puzzle_module = import_puzzle_module(day)
     puzzle_func = puzzle_module.part_one if part == Part.ONE else puzzle_module.part_two
 
@@ -62,7 +65,9 @@ def run_puzzle_func(day: str | int, part: Part) -> bool:
         return False
 
     puzzle = get_input_file_lines(day)
-    actual_puzzle_result = puzzle_func(puzzle)
+    actual_puzzle_result = (
+        profiler.run(puzzle_func, puzzle) if profiler else puzzle_func(puzzle)
+    )
     expected_puzzle_result = (
         puzzle_module.PART_ONE_RESULT
         if part == Part.ONE
@@ -71,6 +76,8 @@ def run_puzzle_func(day: str | int, part: Part) -> bool:
 
     if expected_puzzle_result is None:
         if actual_puzzle_result is not None:
+            import pyperclip
+
             pyperclip.copy(actual_puzzle_result)
             log.info("Puzzle result copied to clipboard: %s", actual_puzzle_result)
         return True
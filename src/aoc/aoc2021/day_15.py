@@ -14,8 +14,6 @@ Your goal is to find a path with the lowest total risk.
 
 from collections.abc import Iterable
 
-import networkx
-
 from .day_09 import neighbor_indices
 
 
@@ -41,6 +39,8 @@ def solution(weights: tuple[tuple[int, ...], ...]) -> int:
     num_rows = len(weights)
     num_cols = len(weights[0])
 
+    import networkx
+
     graph = networkx.DiGraph()
 
     # Add an edge going from each neighbor into this point,
@@ -68,12 +68,14 @@ points.
 Size of set is number inside.
 """
 
-import networkx as nx
 from collections.abc import Iterable
-from networkx import Graph
+from typing import TYPE_CHECKING
 
 from aoc.util import Pt
 
+if TYPE_CHECKING:
+    from networkx import Graph
+
 
 PART_ONE_EXAMPLE = """\
 ..F7.
@@ -104,7 +106,9 @@ DIST = "distance"
 VISITED = "visited"
 
 
-def parse(lines: Iterable[str]) -> tuple[Graph, Pt]:
+def parse(lines: Iterable[str]) -> tuple["Graph", Pt]:
+    from networkx import Graph
+
     graph = Graph()
     start = None
     for row, line in enumerate(lines):
@@ -195,12 +199,16 @@ def parse(lines: Iterable[str]) -> tuple[Graph, Pt]:
 
 
 def part_one(lines: Iterable[str]) -> int:
+    import networkx as nx
+
     graph, start = parse(lines)
     cycle = nx.find_cycle(graph, source=start)
     return len(cycle) // 2
 
 
 def part_two(lines: Iterable[str]) -> int:
+    import networkx as nx
+
     graph, start = parse(lines)
     cycle = nx.find_cycle(graph, source=start)
     cycle_nodes = set()
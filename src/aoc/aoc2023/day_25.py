@@ -10,8 +10,10 @@ Multiply the sizes of the groups together.
 PART 2
 """
 from collections.abc import Iterable
+from typing import TYPE_CHECKING
 
-import networkx as nx
+if TYPE_CHECKING:
+    import networkx as nx
 
 
 PART_ONE_EXAMPLE = """\
@@ -37,7 +39,9 @@ PART_TWO_EXAMPLE_RESULT = None
 PART_TWO_RESULT = -1
 
 
-def parse_lines_to_graph(lines: Iterable[str]) -> nx.Graph:
+def parse_lines_to_graph(lines: Iterable[str]) -> "nx.Graph":
+    import networkx as nx
+
     def line_split(line):
         l_node, rhs = line.split(": ")
         for r_node in rhs.split():
@@ -52,6 +56,8 @@ def part_one(lines: Iterable[str]) -> int:
     # thing = (line for line in lines if line)
     G = parse_lines_to_graph(lines)
 
+    import networkx as nx
+
     bisection = nx.spectral_bisection(G)
 
     if len(bisection) != 2:
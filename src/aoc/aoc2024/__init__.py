@@ -1,8 +1,11 @@
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
 import aoc.util
 import aoc.testing.util as tutil
 
+if TYPE_CHECKING:
+    from aoc.profiling import Profiler
+
 
 def import_puzzle_module(day: str | int):
     return aoc.util.import_puzzle_module(__package__, day)
@@ -12,8 +15,12 @@ def get_input_file_lines(day: str | int) -> Iterable[str]:
     return aoc.util.get_input_file_lines(YEAR, day)
 
 
-def run_puzzle_func(day: str | int, part: aoc.util.Part) -> Optional[bool]:
-    return aoc.util.run_puzzle_func(import_puzzle_module, YEAR, day, part)
+def run_puzzle_func(
+    day: str | int,
+    part: aoc.util.Part,
+    profiler: Optional["Profiler"] = None,
+) -> Optional[bool]:
+    return aoc.util.run_puzzle_func(import_puzzle_module, YEAR, day, part, profiler)
 
 
 def test_puzzle_solution(day: int, part: aoc.util.Part):
@@ -10,8 +10,6 @@ Find biggest clique in connection graph
 """
 from collections.abc import Iterable
 
-import networkx as nx
-
 
 PART_ONE_EXAMPLE = """\
 kh-tc
@@ -55,6 +53,8 @@ PART_TWO_RESULT = "cm,de,ez,gv,hg,iy,or,pw,qu,rs,sn,uc,wq"
 
 
 def part_one(lines: Iterable[str]) -> int:
+    import networkx as nx
+
     g = nx.Graph([line.split("-") for line in lines])
     return sum(
         any(conn.startswith("t") for conn in cycle)
@@ -63,6 +63,8 @@ def part_one(lines: Iterable[str]) -> int:
 
 
 def part_two(lines: Iterable[str]) -> str:
+    import networkx as nx
+
     g = nx.Graph([line.split("-") for line in lines])
     largest_clique = max(nx.find_cliques(g), key=len)
     return ",".join(sorted(largest_clique))
@@ -0,0 +1,211 @@
+"""
+Repeatable benchmarks of puzzle solutions.
+
+Every run is checked against the puzzle's known result, so a fast
+wrong answer never gets recorded as a timing.
+Results can be saved to a JSON baseline and later runs compared against it.
+"""
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from aoc.util import (
+    RESOURCES,
+    Part,
+    find_puzzle_days,
+    get_input_file_lines,
+    import_puzzle_module,
+    result_output_str,
+)
+
+DEFAULT_BASELINE_FILE = RESOURCES / "bench.json"
+DEFAULT_THRESHOLD = 0.1
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    runs: int
+    min: float
+    median: float
+    p95: float
+    peak_memory_kb: int
+
+    def __str__(self) -> str:
+        return (
+            f"{self.runs:>4} {self.min:>9.4f} {self.median:>10.4f} "
+            f"{self.p95:>9.4f} {self.peak_memory_kb / 1024:>9.1f}"
+        )
+
+
+BENCH_HEADER = (
+    f"{'puzzle':<14} {'runs':>4} {'min (s)':>9} {'median (s)':>10} "
+    f"{'p95 (s)':>9} {'peak (MB)':>9}"
+)
+
+
+class WrongAnswer(Exception):
+    pass
+
+
+def bench_key(year: int, day: int, part: Part) -> str:
+    return f"{year}-12-{day:02}/{part.value}"
+
+
+def percentile(timings: list[float], pct: int) -> float:
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[pct - 1]
+
+
+def bench_part(
+    year: int, day: int, part: Part, repeat: int, warmup: int
+) -> Optional[BenchResult]:
+    """Time one puzzle part. Returns None if we can't tell whether it's right."""
+    if repeat < 1:
+        raise ValueError("Need at least one timed run")
+    puzzle_module = import_puzzle_module(f"aoc.aoc{year}", day)
+    puzzle_func = puzzle_module.part_one if part == Part.ONE else puzzle_module.part_two
+    expected = (
+        puzzle_module.PART_ONE_RESULT
+        if part == Part.ONE
+        else puzzle_module.PART_TWO_RESULT
+    )
+    if expected is None:
+        log.info("%-14s no expected result, skipping", bench_key(year, day, part))
+        return None
+
+    # Read the input once so we time the solution, not the disk
+    lines = list(get_input_file_lines(year, day))
+
+    def run_once() -> float:
+        start = time.perf_counter()
+        actual = puzzle_func(iter(lines))
+        elapsed = time.perf_counter() - start
+        if actual != expected:
+            raise WrongAnswer(result_output_str(expected, actual))
+        return elapsed
+
+    for _ in range(warmup):
+        run_once()
+    timings = sorted(run_once() for _ in range(repeat))
+
+    # tracemalloc slows things down, so measure memory on its own run
+    tracemalloc.start()
+    try:
+        run_once()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        runs=repeat,
+        min=timings[0],
+        median=statistics.median(timings),
+        p95=percentile(timings, 95),
+        peak_memory_kb=peak // 1024,
+    )
+
+
+def load_baseline(baseline_file: Path) -> dict[str, BenchResult]:
+    with open(baseline_file, "r") as f:
+        return {key: BenchResult(**value) for key, value in json.load(f).items()}
+
+
+def save_baseline(baseline_file: Path, results: dict[str, BenchResult]) -> None:
+    # Keep entries for puzzles we didn't run this time
+    baseline = load_baseline(baseline_file) if baseline_file.exists() else {}
+    baseline.update(results)
+    baseline_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(baseline_file, "w") as f:
+        json.dump(
+            {key: asdict(result) for key, result in sorted(baseline.items())},
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+def find_regressions(
+    baseline: dict[str, BenchResult],
+    results: dict[str, BenchResult],
+    threshold: float,
+) -> list[str]:
+    """Keys whose median time got slower than baseline by more than threshold"""
+    return [
+        key
+        for key, result in results.items()
+        if key in baseline and result.median > baseline[key].median * (1 + threshold)
+    ]
+
+
+def run_bench(
+    years: Iterable[int],
+    days_arg: Optional[list[int]] = None,
+    parts_arg: Optional[list[int]] = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    baseline_file: Path = DEFAULT_BASELINE_FILE,
+    save: bool = False,
+    compare: bool = False,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> bool:
+    parts = [Part(part) for part in parts_arg] if parts_arg else list(Part)
+    baseline: dict[str, BenchResult] = {}
+    if compare:
+        if baseline_file.exists():
+            baseline = load_baseline(baseline_file)
+        else:
+            log.info("No baseline at %s, nothing to compare against", baseline_file)
+
+    results: dict[str, BenchResult] = {}
+    all_correct = True
+    log.info(BENCH_HEADER + ("  baseline median" if compare else ""))
+    for year in years:
+        days = days_arg or find_puzzle_days(year)
+        for day in days:
+            for part in parts:
+                key = bench_key(year, day, part)
+                try:
+                    result = bench_part(year, day, part, repeat, warmup)
+                except WrongAnswer as e:
+                    log.info("%-14s wrong answer: %s", key, e)
+                    all_correct = False
+                    continue
+                except (Exception, SystemExit) as e:
+                    # Keep going, so one broken part doesn't lose every result
+                    log.info("%-14s %s: %s", key, type(e).__name__, e)
+                    all_correct = False
+                    continue
+                if result is None:
+                    continue
+                results[key] = result
+
+                line = f"{key:<14} {result}"
+                if compare and key in baseline:
+                    change = result.median / baseline[key].median - 1
+                    line += f"  {baseline[key].median:>9.4f} ({change:+.0%})"
+                log.info(line)
+
+    if save:
+        save_baseline(baseline_file, results)
+        log.info("Saved %d results to %s", len(results), baseline_file)
+
+    regressions = find_regressions(baseline, results, threshold) if compare else []
+    for key in regressions:
+        log.info(
+            "REGRESSION %s median %.4fs > baseline %.4fs + %.0f%%",
+            key,
+            results[key].median,
+            baseline[key].median,
+            threshold * 100,
+        )
+
+    return all_correct and not regressions
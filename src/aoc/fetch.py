@@ -0,0 +1,94 @@
+"""
+Download every missing puzzle input for a year.
+
+All requests share one pooled HTTP session, at most `jobs` run at once,
+and request starts are spaced at least `interval` seconds apart
+so we go easy on the Advent of Code servers.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from aoc.util import (
+    AOC_URL,
+    DOWNLOAD_TIMEOUT,
+    INPUT_RESOURCES,
+    download_puzzle_data,
+    find_input_file,
+    find_puzzle_days,
+    input_file_is_valid,
+    make_session,
+    write_input_file,
+)
+
+DEFAULT_JOBS = 4
+DEFAULT_INTERVAL = 0.5
+
+log = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Space out calls to wait() at least interval seconds apart, across threads"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        time.sleep(start - now)
+
+
+def fetch_year(
+    year: int,
+    days: Optional[list[int]] = None,
+    jobs: int = DEFAULT_JOBS,
+    interval: float = DEFAULT_INTERVAL,
+    base_url: str = AOC_URL,
+    cookie: Optional[str] = None,
+    input_dir: Path = INPUT_RESOURCES,
+    timeout: float = DOWNLOAD_TIMEOUT,
+) -> bool:
+    """Download inputs for days that don't have a valid input file yet.
+    Returns True if every input is now present."""
+    days = days or find_puzzle_days(year)
+    missing = [
+        day
+        for day in days
+        if not input_file_is_valid(find_input_file(year, day, input_dir))
+    ]
+    log.info(
+        "%d of %d inputs for %d already downloaded",
+        len(days) - len(missing),
+        len(days),
+        year,
+    )
+    if not missing:
+        return True
+
+    session = make_session(cookie, pool_size=jobs)
+    rate_limiter = RateLimiter(interval)
+
+    def fetch_day(day: int) -> bool:
+        rate_limiter.wait()
+        try:
+            data = download_puzzle_data(year, day, session, base_url, timeout)
+        except requests.RequestException as e:
+            status = e.response.status_code if e.response is not None else e
+            log.info("%d-12-%02d failed: %s", year, day, status)
+            return False
+        write_input_file(find_input_file(year, day, input_dir), data)
+        log.info("%d-12-%02d downloaded %d bytes", year, day, len(data))
+        return True
+
+    with session, ThreadPoolExecutor(max_workers=jobs) as executor:
+        return all(list(executor.map(fetch_day, missing)))
@@ -0,0 +1,159 @@
+"""
+Profile a single puzzle function call.
+
+Three modes:
+- cprofile: deterministic function call profile, top functions by own time
+- tracemalloc: top allocation sites by size
+- sampling: samples the call stack on a timer, top functions by own samples
+
+tracemalloc and sampling can also write collapsed stacks
+("frame;frame;frame count" per line), which flamegraph tools
+like flamegraph.pl, inferno, or speedscope can render.
+"""
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+
+class ProfileMode(Enum):
+    CPROFILE = "cprofile"
+    TRACEMALLOC = "tracemalloc"
+    SAMPLING = "sampling"
+
+
+SAMPLE_INTERVAL = 0.001
+
+
+def frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def write_collapsed_stacks(collapsed_file: Path, stacks: Counter[str]) -> None:
+    with open(collapsed_file, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    log.info("Wrote %d collapsed stacks to %s", len(stacks), collapsed_file)
+
+
+@dataclass(frozen=True)
+class Profiler:
+    mode: ProfileMode = ProfileMode.CPROFILE
+    top: int = 20
+    collapsed_file: Optional[Path] = None
+
+    def run[T, R](self, func: Callable[[T], R], arg: T) -> R:
+        """Call func(arg) under the profiler and log a report"""
+        if self.mode == ProfileMode.CPROFILE:
+            return self._run_cprofile(func, arg)
+        elif self.mode == ProfileMode.TRACEMALLOC:
+            return self._run_tracemalloc(func, arg)
+        else:
+            return self._run_sampling(func, arg)
+
+    def _run_cprofile[T, R](self, func: Callable[[T], R], arg: T) -> R:
+        if self.collapsed_file is not None:
+            log.warning("cprofile doesn't record stacks, not writing collapsed stacks")
+        profiler = cProfile.Profile()
+        result = profiler.runcall(func, arg)
+
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        log.info(report.getvalue())
+        return result
+
+    def _run_tracemalloc[T, R](self, func: Callable[[T], R], arg: T) -> R:
+        tracemalloc.start(64)
+        try:
+            result = func(arg)
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Leave out the allocations tracemalloc made itself
+        snapshot = snapshot.filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        log.info("Peak traced memory: %.1f MB", peak / (1 << 20))
+        log.info("Top %d allocation sites still live at the end:", self.top)
+        for stat in snapshot.statistics("lineno")[: self.top]:
+            log.info("  %s", stat)
+
+        if self.collapsed_file is not None:
+            stacks: Counter[str] = Counter()
+            for stat in snapshot.statistics("traceback"):
+                # Tracebacks are most recent call last, as flamegraphs want.
+                # Leave off everything from this function up.
+                frames = list(stat.traceback)
+                here = max(
+                    (i for i, frame in enumerate(frames) if frame.filename == __file__),
+                    default=-1,
+                )
+                stack = ";".join(
+                    f"{Path(frame.filename).name}:{frame.lineno}"
+                    for frame in frames[here + 1 :]
+                )
+                stacks[stack] += stat.size
+            write_collapsed_stacks(self.collapsed_file, stacks)
+        return result
+
+    def _run_sampling[T, R](self, func: Callable[[T], R], arg: T) -> R:
+        target_thread = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        done = threading.Event()
+
+        def sample_stacks():
+            while not done.wait(SAMPLE_INTERVAL):
+                frame = sys._current_frames().get(target_thread)
+                names = []
+                # Walk out to this function, leave off everything above it
+                while frame is not None and frame.f_code is not run_code:
+                    names.append(frame_name(frame))
+                    frame = frame.f_back
+                if names:
+                    stacks[";".join(reversed(names))] += 1
+
+        run_code = self._run_sampling.__code__
+        sampler = threading.Thread(target=sample_stacks, daemon=True)
+        switch_interval = sys.getswitchinterval()
+        # Give the sampler thread a chance to grab the GIL on time
+        sys.setswitchinterval(SAMPLE_INTERVAL / 2)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            result = func(arg)
+        finally:
+            elapsed = time.perf_counter() - start
+            done.set()
+            sampler.join()
+            sys.setswitchinterval(switch_interval)
+
+        total = sum(stacks.values())
+        log.info("%d samples over %.3fs", total, elapsed)
+        own_samples: Counter[str] = Counter()
+        for stack, count in stacks.items():
+            own_samples[stack.rsplit(";", 1)[-1]] += count
+        if total:
+            log.info("Top %d functions by own samples:", self.top)
+            for name, count in own_samples.most_common(self.top):
+                log.info("  %6.1f%% %6d  %s", 100 * count / total, count, name)
+
+        if self.collapsed_file is not None:
+            write_collapsed_stacks(self.collapsed_file, stacks)
+        return result
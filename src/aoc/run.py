@@ -1,10 +1,34 @@
 import datetime
-from typing import Optional
+import logging
+import resource
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-from aoc.util import Part, import_year
+from aoc.util import (
+    INPUT_RESOURCES,
+    Part,
+    find_puzzle_days,
+    get_input_file_lines,
+    import_puzzle_module,
+    import_year,
+    result_output_str,
+)
 
+if TYPE_CHECKING:
+    from aoc.profiling import Profiler
 
-def run_puzzle(datestamp: Optional[str], parts_arg: Optional[list[int]] = None) -> bool:
+log = logging.getLogger(__name__)
+
+
+def run_puzzle(
+    datestamp: Optional[str],
+    parts_arg: Optional[list[int]] = None,
+    profiler: Optional["Profiler"] = None,
+) -> bool:
     date = (
         datetime.date.today()
         if not datestamp
@@ -15,15 +39,145 @@ def run_puzzle(datestamp: Optional[str], parts_arg: Optional[list[int]] = None)
     year_package = import_year(date.year)
 
     if parts_arg:
-        return all(year_package.run_puzzle_func(date.day, part) for part in parts)
+        return all(
+            year_package.run_puzzle_func(date.day, part, profiler) for part in parts
+        )
 
     # If they didn't pass an explicit parts arg...
     # - run part 1
     # - If part 1 returns None, stop and exit
     # - Otherwise return part 1 result AND part 2 result
 
-    part1_result = year_package.run_puzzle_func(date.day, Part.ONE)
+    part1_result = year_package.run_puzzle_func(date.day, Part.ONE, profiler)
     if part1_result is None:
         # This means we found part 1's result and copied it to the clipboard
         return True
-    return part1_result and year_package.run_puzzle_func(date.day, Part.TWO)
+    return part1_result and year_package.run_puzzle_func(date.day, Part.TWO, profiler)
+
+
+@dataclass(frozen=True)
+class PartReport:
+    day: int
+    part: Part
+    expected: int | str | None = None
+    actual: int | str | None = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_rss_kb: int = 0
+    error: Optional[str] = None
+
+    @property
+    def passed(self) -> Optional[bool]:
+        """None if we don't know the answer yet"""
+        if self.error is not None:
+            return False
+        if self.expected is None:
+            return None
+        return self.expected == self.actual
+
+    def __str__(self) -> str:
+        if self.error is not None:
+            result = self.error
+        elif self.expected is None:
+            result = f"actual {self.actual}, no expected result yet"
+        else:
+            result = result_output_str(self.expected, self.actual)
+        return (
+            f"{self.day:>3} {self.part.value:>4} "
+            f"{self.wall_time:>9.3f} {self.cpu_time:>9.3f} "
+            f"{self.peak_rss_kb / 1024:>8.1f}  {result}"
+        )
+
+
+REPORT_HEADER = f"{'day':>3} {'part':>4} {'wall (s)':>9} {'cpu (s)':>9} {'rss (MB)':>8}"
+
+
+def peak_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_puzzle_part_report(
+    year: int, day: int, part: Part, input_dir: Path = INPUT_RESOURCES
+) -> PartReport:
+    """Check a puzzle part's example, then time it on the real input.
+    Meant to run in its own process so peak RSS belongs to this part alone."""
+    try:
+        puzzle_module = import_puzzle_module(f"aoc.aoc{year}", day)
+        if part == Part.ONE:
+            puzzle_func = puzzle_module.part_one
+            raw_example = puzzle_module.PART_ONE_EXAMPLE
+            expected_example = puzzle_module.PART_ONE_EXAMPLE_RESULT
+            expected = puzzle_module.PART_ONE_RESULT
+        else:
+            puzzle_func = puzzle_module.part_two
+            raw_example = puzzle_module.PART_TWO_EXAMPLE
+            expected_example = puzzle_module.PART_TWO_EXAMPLE_RESULT
+            expected = puzzle_module.PART_TWO_RESULT
+
+        if raw_example and expected_example is not None:
+            example = iter(raw_example.rstrip("\n").split("\n"))
+            actual_example = puzzle_func(example)
+            if actual_example != expected_example:
+                return PartReport(
+                    day,
+                    part,
+                    error="Example: "
+                    + result_output_str(expected_example, actual_example),
+                )
+
+        lines = get_input_file_lines(year, day, input_dir)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        actual = puzzle_func(lines)
+        cpu_time = time.process_time() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+    except (Exception, SystemExit) as e:
+        return PartReport(day, part, error=f"{type(e).__name__}: {e}")
+
+    return PartReport(day, part, expected, actual, wall_time, cpu_time, peak_rss_kb())
+
+
+def run_year(
+    year: int,
+    parts_arg: Optional[list[int]] = None,
+    jobs: Optional[int] = None,
+    input_dir: Path = INPUT_RESOURCES,
+) -> bool:
+    """Run every part of every day in a year in parallel, log a timing report"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    parts = [Part(part) for part in parts_arg] if parts_arg else list(Part)
+    tasks = [(day, part) for day in find_puzzle_days(year) for part in parts]
+
+    wall_start = time.perf_counter()
+    reports: list[PartReport] = []
+    log.info(REPORT_HEADER)
+    # One process per part so each one's peak RSS is its own
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as executor:
+        for report in executor.map(
+            run_puzzle_part_report,
+            (year for _ in tasks),
+            (day for day, _ in tasks),
+            (part for _, part in tasks),
+            (input_dir for _ in tasks),
+        ):
+            log.info(report)
+            reports.append(report)
+    wall_time = time.perf_counter() - wall_start
+
+    log.info(summary(reports, wall_time))
+    return all(report.passed is not False for report in reports)
+
+
+def summary(reports: Iterable[PartReport], wall_time: float) -> str:
+    reports = list(reports)
+    passed = sum(report.passed is True for report in reports)
+    failed = sum(report.passed is False for report in reports)
+    unknown = len(reports) - passed - failed
+    total_cpu = sum(report.cpu_time for report in reports)
+    return (
+        f"{passed} passed, {failed} failed, {unknown} unknown. "
+        f"Wall time {wall_time:.3f}s, summed part CPU time {total_cpu:.3f}s"
+    )
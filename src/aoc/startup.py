@@ -0,0 +1,77 @@
+"""
+Measure how long it takes a fresh interpreter to import modules.
+
+Uses python -X importtime in a subprocess, so nothing this process
+has already imported gets in the way.
+"""
+import subprocess
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Cold start of the CLI plus one trivial puzzle module must stay under this
+STARTUP_BUDGET_MS = 150
+
+# Modules that only some code paths need, so must not be imported on startup
+DEFERRED_MODULES = ("requests", "pyperclip", "networkx", "numpy", "scipy", "pytest")
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def import_times(modules: Iterable[str]) -> list[ImportTime]:
+    """Import modules in a fresh interpreter, return the time taken by each
+    module it imported, in the order they finished importing"""
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        # Nested imports are indented two more spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us), depth))
+    return times
+
+
+def total_import_time_us(times: Iterable[ImportTime]) -> int:
+    return sum(t.cumulative_us for t in times if t.depth == 0)
+
+
+def startup_modules(year: int, day: int) -> list[str]:
+    return ["aoc.__main__", f"aoc.aoc{year}.day_{day:02}"]
+
+
+def startup_report(year: int, day: int, top: int = 25) -> str:
+    times = import_times(startup_modules(year, day))
+    total_ms = total_import_time_us(times) / 1000
+
+    lines = [
+        f"Cold start imports for {year}-12-{day:02}: {total_ms:.1f} ms "
+        f"(budget {STARTUP_BUDGET_MS} ms)",
+        f"{'self (ms)':>9} {'cumul (ms)':>10}  module",
+    ]
+    for t in sorted(times, key=lambda t: t.self_us, reverse=True)[:top]:
+        lines.append(
+            f"{t.self_us / 1000:>9.1f} {t.cumulative_us / 1000:>10.1f}  {t.module}"
+        )
+    imported = {t.module for t in times}
+    deferred = [module for module in DEFERRED_MODULES if module in imported]
+    if deferred:
+        lines.append(
+            "Imported on startup but should be deferred: " + ", ".join(deferred)
+        )
+    return "\n".join(lines)
@@ -1,7 +1,5 @@
 from collections.abc import Callable, Iterable
 
-import pytest
-
 from aoc.util import Part, PuzzleModule
 
 
@@ -44,6 +42,9 @@ def template_test_puzzle_solution(
 
 
 def generate_pytest_generate_tests(marks: dict[tuple[int, Part], str], days: int):
+    # pytest is a dev dependency, and the year packages import this module
+    import pytest
+
     def pytest_generate_tests(metafunc):
         # Find puzzle modules
         # Parametrize test func
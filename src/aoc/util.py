@@ -1,19 +1,28 @@
+import functools
+import hashlib
 import importlib
 import logging
 import os
+import pkgutil
+import tempfile
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Protocol, Self, cast
+from typing import TYPE_CHECKING, Optional, Protocol, Self, cast
 
-import pyperclip
-import requests
-import requests.utils
+if TYPE_CHECKING:
+    import numpy as np
+
+    from aoc.profiling import Profiler
 
 RESOURCES = Path(__package__).parent / "resources"
 INPUT_RESOURCES = RESOURCES / "inputs"
 SESSION_COOKIE_FILE = RESOURCES / "session.txt"
+AOC_URL = "https://adventofcode.com"
+# Seconds to wait to connect, or between bytes of a response
+DOWNLOAD_TIMEOUT = 30.0
+USER_AGENT = "advent-of-code solutions (John Flavin) via python-requests"
 
 SUCCESS_EMOJI = "\u2705"
 FAILURE_EMOJI = "\u274C"
@@ -35,7 +44,9 @@ class Part(Enum):
 
 
 class YearPackage(Protocol):
-    def run_puzzle_func(self, day: str | int, part: Part) -> bool: ...
+    def run_puzzle_func(
+        self, day: str | int, part: Part, profiler: Optional["Profiler"] = None
+    ) -> bool: ...
 
 
 class PuzzleModule(Protocol):
@@ -62,6 +73,7 @@ def run_puzzle_func(
     year: str | int,
     day: str | int,
     part: Part,
+    profiler: Optional["Profiler"] = None,
 ) -> Optional[bool]:
     log.info(f"Part {part.value}")
     puzzle_module = import_puzzle_module_func(day)
@@ -96,7 +108,9 @@ def run_puzzle_func(
         return False
 
     puzzle = get_input_file_lines(year, day)
-    actual_puzzle_result = puzzle_func(puzzle)
+    actual_puzzle_result = (
+        profiler.run(puzzle_func, puzzle) if profiler else puzzle_func(puzzle)
+    )
     expected_puzzle_result = (
         puzzle_module.PART_ONE_RESULT
         if part == Part.ONE
@@ -105,6 +119,9 @@ def run_puzzle_func(
 
     if expected_puzzle_result is None:
         if actual_puzzle_result is not None:
+            # Imported here so we only pay for it when we need it
+            import pyperclip
+
             pyperclip.copy(actual_puzzle_result)
             log.info("Puzzle result copied to clipboard: %s", actual_puzzle_result)
         return None
@@ -121,13 +138,45 @@ def import_year(year: str | int) -> YearPackage:
     return cast(YearPackage, module)
 
 
-def download_puzzle_data(year: str | int, day: str | int) -> bytes:
-    url = f"https://adventofcode.com/{year}/day/{day}/input"
-    cookie = read_session_cookie()
+def find_puzzle_days(year: str | int) -> list[int]:
+    """Days that have a puzzle module in the year's package"""
+    year_package = importlib.import_module(f"aoc.aoc{year}", package=__package__)
+    return sorted(
+        int(module.name.removeprefix("day_"))
+        for module in pkgutil.iter_modules(year_package.__path__)
+        if module.name.startswith("day_")
+    )
+
+
+def make_session(cookie: Optional[str] = None, pool_size: int = 1):
+    """HTTP session that sends our session cookie with every request"""
+    import requests
+    import requests.adapters
+    import requests.utils
 
     s = requests.Session()
-    requests.utils.add_dict_to_cookiejar(s.cookies, {"session": cookie})
-    r = s.get(url)
+    s.headers["User-Agent"] = USER_AGENT
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    requests.utils.add_dict_to_cookiejar(
+        s.cookies, {"session": cookie if cookie is not None else read_session_cookie()}
+    )
+    return s
+
+
+def download_puzzle_data(
+    year: str | int,
+    day: str | int,
+    session=None,
+    base_url: str = AOC_URL,
+    timeout: float = DOWNLOAD_TIMEOUT,
+) -> bytes:
+    url = f"{base_url}/{year}/day/{day}/input"
+    s = session if session is not None else make_session()
+    r = s.get(url, timeout=timeout)
     r.raise_for_status()
     return r.content
 
@@ -137,32 +186,122 @@ def read_session_cookie() -> str:
         return f.read().strip()
 
 
-def find_input_file(year: str | int, day: str | int) -> Path:
-    return INPUT_RESOURCES / f"{year}-12-{day:02}.txt"
+def find_input_file(
+    year: str | int, day: str | int, input_dir: Path = INPUT_RESOURCES
+) -> Path:
+    return input_dir / f"{year}-12-{day:02}.txt"
+
+
+def find_input_hash_file(input_file: Path) -> Path:
+    return input_file.with_name(input_file.name + ".sha256")
+
+
+def write_input_file(input_file: Path, data: bytes) -> None:
+    """Write input data and its hash, each atomically.
+    A half-written file never ends up at the final path."""
+    input_file.parent.mkdir(parents=True, exist_ok=True)
+    for path, contents in (
+        (input_file, data),
+        (find_input_hash_file(input_file), hashlib.sha256(data).hexdigest().encode()),
+    ):
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(contents)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+
+
+def input_file_is_valid(input_file: Path) -> bool:
+    """Input file exists and matches its stored hash.
+    Files from before we stored hashes are trusted."""
+    if not input_file.exists():
+        return False
+    hash_file = find_input_hash_file(input_file)
+    if not hash_file.exists():
+        return True
+    expected = hash_file.read_text().strip()
+    return hashlib.sha256(input_file.read_bytes()).hexdigest() == expected
 
 
 def get_input_file_data_and_write_file(
     year: str | int, day: str | int, input_file: Path
 ):
+    import requests
+
     try:
-        with open(input_file, "wb") as f:
-            f.write(download_puzzle_data(year, day))
+        write_input_file(input_file, download_puzzle_data(year, day))
     except requests.RequestException as e:
-        os.remove(input_file)
-        print(e.response.status_code, e.response.text)
+        if e.response is not None:
+            print(e.response.status_code, e.response.text)
         raise SystemExit(f"Could not load data for {year}-12-{day:02}")
 
 
-def get_input_file_lines(year: str | int, day: str | int) -> Iterable[str]:
-    input_file = find_input_file(year, day)
-    if not input_file.exists():
+@functools.cache
+def _read_input_file_bytes(year: int, day: int, input_dir: Path) -> bytes:
+    input_file = find_input_file(year, day, input_dir)
+    if not input_file_is_valid(input_file):
         get_input_file_data_and_write_file(year, day, input_file)
+    return input_file.read_bytes()
+
+
+def get_input_file_bytes(
+    year: str | int, day: str | int, input_dir: Path = INPUT_RESOURCES
+) -> bytes:
+    """Raw input file contents.
+    Cached, so each input is read at most once per process."""
+    return _read_input_file_bytes(int(year), int(day), input_dir)
+
+
+@functools.cache
+def _split_input_file_lines(year: int, day: int, input_dir: Path) -> tuple[str, ...]:
+    lines = _read_input_file_bytes(year, day, input_dir).decode().split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return tuple(line.rstrip() for line in lines)
+
+
+def get_input_file_line_tuple(
+    year: str | int, day: str | int, input_dir: Path = INPUT_RESOURCES
+) -> tuple[str, ...]:
+    """Input lines with trailing whitespace stripped. Cached per process."""
+    return _split_input_file_lines(int(year), int(day), input_dir)
+
+
+def get_input_file_lines(
+    year: str | int, day: str | int, input_dir: Path = INPUT_RESOURCES
+) -> Iterable[str]:
+    return iter(get_input_file_line_tuple(year, day, input_dir))
+
+
+def bytes_to_grid(data: bytes) -> "np.ndarray":
+    """View newline-separated rows of equal length as a 2D uint8 array.
+    The array shares memory with data, so it is read-only if data is bytes."""
+    import numpy as np
+
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    width = data.index(b"\n") + 1
+    if len(data) % width != 0:
+        raise ValueError("Rows are not all the same length")
+    grid = np.frombuffer(data, dtype=np.uint8).reshape(-1, width)
+    if (grid[:, -1] != ord("\n")).any():
+        raise ValueError("Rows are not all the same length")
+    return grid[:, :-1]
+
+
+def lines_to_grid(lines: Iterable[str]) -> "np.ndarray":
+    """Writable 2D uint8 array of the characters in lines, one row per line"""
+    return bytes_to_grid(bytearray("\n".join(lines).encode()))
 
-    def inner():
-        with input_file.open("r") as f:
-            yield from f
 
-    return map(lambda line: line.rstrip(), inner())
+def get_input_file_grid(
+    year: str | int, day: str | int, input_dir: Path = INPUT_RESOURCES
+) -> "np.ndarray":
+    """Read-only 2D uint8 array of the characters in a character map input"""
+    return bytes_to_grid(get_input_file_bytes(year, day, input_dir))
 
 
 type Pt = tuple[int, int]
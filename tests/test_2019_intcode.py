@@ -1,34 +1,46 @@
 import math
 import random
+from collections import deque
 
 import pytest
 
-from aoc.aoc2019.intcode import Intcode, run_amplifiers
+from aoc.aoc2019.intcode import (
+    Intcode,
+    ReferenceIntcode,
+    run_amplifiers,
+    run_round_robin,
+)
+from aoc.aoc2019.intcode_farm import IntcodeFarm
+
 
+@pytest.fixture(params=(Intcode, ReferenceIntcode))
+def engine(request):
+    return request.param
 
-def test_add():
+
+def test_add(engine):
     program = list(map(int, "1,0,0,0,99".split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run()
     assert ic.memory == [2, 0, 0, 0, 99]
 
 
-def test_multiply():
+def test_multiply(engine):
     program = list(map(int, "2,3,0,3,99".split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run()
     assert ic.memory == [2, 3, 0, 6, 99]
 
     program = list(map(int, "2,4,4,5,99,0".split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run()
     assert ic.memory == [2, 4, 4, 5, 99, 9801]
 
 
-def test_opcode3_4():
+def test_opcode3_4(engine):
     """Outputs whatever it gets as input"""
     program = list(map(int, "3,0,4,0,99".split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     random_val = random.randint(0, 1024)
     ic.run(random_val)
     output = ic.outputs
@@ -36,118 +48,118 @@ def test_opcode3_4():
     assert output[0] == random_val
 
 
-def test_param_mode():
+def test_param_mode(engine):
     program = list(map(int, "1002,4,3,4,33".split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run()
     assert ic.memory == [1002, 4, 3, 4, 99]
 
 
-def test_jump_position_mode():
+def test_jump_position_mode(engine):
     """Take an input, output 0 if input was 0 or 1 if input was non-zero"""
     program = list(map(int, "3,12,6,12,15,1,13,14,13,4,13,99,-1,0,1,9".split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(0)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 0
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(random.randint(1, 100))
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1
 
 
-def test_jump_immediate_mode():
+def test_jump_immediate_mode(engine):
     """Take an input, output 0 if input was 0 or 1 if input was non-zero"""
     program = list(map(int, "3,12,6,12,15,1,13,14,13,4,13,99,-1,0,1,9".split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(0)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 0
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(random.randint(1, 100))
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1
 
 
-def test_equals_position_mode():
+def test_equals_position_mode(engine):
     """Using position mode, consider whether the input
     is equal to 8; output 1 (if it is) or 0 (if it is not)."""
     program = list(map(int, "3,9,8,9,10,9,4,9,99,-1,8".split(",")))
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(1)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 0
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(8)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1
 
 
-def test_equals_immediate_mode():
+def test_equals_immediate_mode(engine):
     """UUsing immediate mode, consider whether the input
     is equal to 8; output 1 (if it is) or 0 (if it is not)."""
     program = list(map(int, "3,3,1108,-1,8,3,4,3,99".split(",")))
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(1)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 0
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(8)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1
 
 
-def test_less_than_position_mode():
+def test_less_than_position_mode(engine):
     """Using position mode, consider whether the input
     is less than 8; output 1 (if it is) or 0 (if it is not)."""
     program = list(map(int, "3,9,7,9,10,9,4,9,99,-1,8".split(",")))
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(1)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(8)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 0
 
 
-def test_less_than_immediate_mode():
+def test_less_than_immediate_mode(engine):
     """Using immediate mode, consider whether the input
     is less than 8; output 1 (if it is) or 0 (if it is not)."""
     program = list(map(int, "3,3,1107,-1,8,3,4,3,99".split(",")))
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(1)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(8)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 0
 
 
-def test_less_greater_equals_8():
+def test_less_greater_equals_8(engine):
     """The example program uses an input instruction to ask for a single number.
     The program will then output 999 if the input value is below 8,
     output 1000 if the input value is equal to 8,
@@ -159,44 +171,44 @@ def test_less_greater_equals_8():
     )
     program = list(map(int, program_str.split(",")))
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(random.randint(-10, 7))
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 999
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(8)
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1000
 
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run(random.randint(9, 100))
     output = ic.outputs
     assert len(output) == 1
     assert output[0] == 1001
 
 
-def test_quine():
+def test_quine(engine):
     program_str = "109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,99"
     program = list(map(int, program_str.split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run()
     assert ic.outputs == program
 
 
-def test_large_nums():
+def test_large_nums(engine):
     program_str = "1102,34915192,34915192,7,4,7,99,0"
     program = list(map(int, program_str.split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run()
     big = ic.outputs[0]
     assert math.log10(big) > 15
 
     program_str = "104,1125899906842624,99"
     program = list(map(int, program_str.split(",")))
-    ic = Intcode(program)
+    ic = engine(program)
     ic.run()
     big = ic.outputs[0]
     assert big == program[1]
@@ -243,8 +255,96 @@ def test_large_nums():
     ),
 )
 def test_amplifier_sequence(
-    program_str: str, input_seq: tuple[int], feedback: bool, expected_output: int
+    program_str: str,
+    input_seq: tuple[int],
+    feedback: bool,
+    expected_output: int,
+    engine,
 ):
     program = list(map(int, program_str.split(",")))
 
-    assert run_amplifiers(program, input_seq, feedback) == expected_output
+    assert run_amplifiers(program, input_seq, feedback, engine) == expected_output
+
+
+def test_memory_grows_on_demand():
+    """Write well past the end of the program, then read it back"""
+    program = list(map(int, "1101,5,6,1000,4,1000,99".split(",")))
+    ic = Intcode(program)
+    ic.run()
+    assert ic.outputs == [11]
+    assert ic.mem[1000] == 11
+
+
+def test_instructions_run(engine):
+    """Pausing for input and growing memory don't count an instruction twice"""
+    program = list(map(int, "3,20,1101,5,6,1000,4,1000,99".split(",")))
+    ic = engine(program)
+    ic.run()
+    assert ic.instructions_run == 0
+    ic.run(7)
+    assert ic.outputs == [11]
+    assert ic.instructions_run == 4
+
+
+def test_invalid_instruction():
+    ic = Intcode([1, 0, 0, 0, 42])
+    with pytest.raises(RuntimeError):
+        ic.run()
+
+
+def test_fork(engine):
+    """Fork a machine paused on input and feed the copies different values"""
+    program = list(map(int, "3,9,8,9,10,9,4,9,99,-1,8".split(",")))
+    ic = engine(program)
+    ic.run()
+    fork = ic.fork()
+
+    ic.run(8)
+    fork.run(1)
+    assert ic.outputs == [1]
+    assert fork.outputs == [0]
+    assert ic.is_halted and fork.is_halted
+
+
+def test_snapshot():
+    program = list(map(int, "3,20,4,20,3,20,4,20,99".split(",")))
+    ic = Intcode(program)
+    ic.run(5)
+    state = ic.snapshot()
+
+    ic.run(6)
+    assert ic.outputs == [5, 6]
+
+    restored = Intcode.from_snapshot(state)
+    restored.run(7)
+    assert restored.outputs == [5, 7]
+    assert restored.is_halted
+
+
+def test_farm():
+    """Results come back in the same order the inputs went in"""
+    program = list(map(int, "3,9,7,9,10,9,4,9,99,-1,8".split(",")))
+    inputs = [(i,) for i in range(16)]
+    with IntcodeFarm(program, max_workers=2, chunksize=3) as farm:
+        outputs = list(farm.run(inputs))
+    assert outputs == [[int(i < 8)] for i in range(16)]
+
+
+def test_round_robin(engine):
+    """First machine outputs each input twice, second adds pairs of inputs.
+    Nothing gets lost when a machine outputs more than once per input."""
+    doubler = list(map(int, "3,20,4,20,4,20,1105,1,0".split(",")))
+    adder = list(map(int, "3,20,3,21,1,20,21,22,4,22,1105,1,0".split(",")))
+
+    first_in = deque([1, 2, 3])
+    middle = deque()
+    last_out = deque()
+    machines = [
+        engine(doubler, inputs=first_in, outputs=middle),
+        engine(adder, inputs=middle, outputs=last_out),
+    ]
+    run_round_robin(machines)
+
+    assert list(last_out) == [2, 4, 6]
+    assert not first_in and not middle
+    assert all(ic.is_waiting for ic in machines)
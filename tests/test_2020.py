@@ -1,3 +1,5 @@
+import importlib.util
+
 import pytest
 
 from aoc.util import Part
@@ -6,7 +8,10 @@ from aoc.testing.util import generate_pytest_generate_tests
 
 
 marks = {
-    (15, Part.TWO): pytest.mark.skip("Takes too long"),
+    (15, Part.TWO): pytest.mark.skipif(
+        importlib.util.find_spec("numba") is None,
+        reason="Takes too long without numba",
+    ),
     (23, Part.TWO): pytest.mark.skip("Takes too long"),
 }
 
@@ -0,0 +1,32 @@
+import pytest
+
+from aoc.aoc2020.day_15 import compiled_speak_loop, run, speak_loop
+
+
+@pytest.fixture(params=("python", "numba"))
+def loop(request):
+    if request.param == "python":
+        return speak_loop
+    pytest.importorskip("numba")
+    return compiled_speak_loop()
+
+
+@pytest.mark.parametrize(
+    "starting,expected",
+    (
+        ("0,3,6", 436),
+        ("1,3,2", 1),
+        ("2,1,3", 10),
+        ("1,2,3", 27),
+        ("2,3,1", 78),
+        ("3,2,1", 438),
+        ("3,1,2", 1836),
+    ),
+)
+def test_speak_loop(loop, starting: str, expected: int):
+    assert run([starting], 2020, loop) == expected
+
+
+def test_loops_agree(loop):
+    """Long enough for numbers to be spoken many times over"""
+    assert run(["0,3,6"], 100_000, loop) == run(["0,3,6"], 100_000, speak_loop)
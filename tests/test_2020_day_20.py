@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from aoc.aoc2020.day_20 import (
+    assemble,
+    edge_signature,
+    edges,
+    index_edges,
+    orientations,
+)
+
+TILE_SIZE = 10
+
+
+def random_tiles(side_length: int, seed: int) -> dict[int, np.ndarray]:
+    """Cut a random image into overlapping tiles, then shuffle, rotate and
+    flip them. Every edge is unique, but some are palindromes."""
+    rng = random.Random(seed)
+    size = side_length * (TILE_SIZE - 1) + 1
+    while True:
+        image = np.array(
+            [[rng.random() < 0.5 for _ in range(size)] for _ in range(size)]
+        )
+        layout = [
+            image[
+                row * (TILE_SIZE - 1) : row * (TILE_SIZE - 1) + TILE_SIZE,
+                col * (TILE_SIZE - 1) : col * (TILE_SIZE - 1) + TILE_SIZE,
+            ]
+            for row in range(side_length)
+            for col in range(side_length)
+        ]
+        tile_ids = rng.sample(range(1000, 10000), len(layout))
+        tiles = {
+            tile_id: list(orientations(tile))[rng.randrange(8)]
+            for tile_id, tile in zip(tile_ids, layout)
+        }
+        # Outer edges match nothing, shared edges match one other tile
+        matches = [len(ids) for ids in index_edges(tiles).values()]
+        if matches.count(1) == 4 * side_length and max(matches) == 2:
+            return tiles
+
+
+def test_edge_signature_ignores_flips():
+    edge = np.array([1, 0, 0, 1, 1, 0, 1, 0, 0, 0], dtype=bool)
+    assert edge_signature(edge) == edge_signature(edge[::-1])
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_assemble(seed: int):
+    tiles = random_tiles(4, seed)
+    rows = assemble(tiles)
+    for row, next_row in zip(rows, rows[1:]):
+        for tile, below in zip(row, next_row):
+            assert np.array_equal(edges(tile)[2], edges(below)[0])
+    for row in rows:
+        for tile, right in zip(row, row[1:]):
+            assert np.array_equal(edges(tile)[1], edges(right)[3])
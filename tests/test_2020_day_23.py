@@ -0,0 +1,33 @@
+import pickle
+
+from aoc.aoc2020.day_23 import CupGame
+
+EXAMPLE_CUPS = [3, 8, 9, 1, 2, 5, 4, 6, 7]
+
+
+def test_example_ten_moves():
+    game = CupGame(EXAMPLE_CUPS)
+    game.play(10)
+    assert "".join(map(str, game.clockwise_of(1))) == "92658374"
+
+
+def test_reduced_part_two():
+    """Part two's rules on a thousand cups instead of a million"""
+    game = CupGame(EXAMPLE_CUPS + list(range(10, 1_001)))
+    game.play(10_000)
+    cup1 = game.next_cup[1]
+    cup2 = game.next_cup[cup1]
+    assert (cup1, cup2) == (524, 822)
+
+
+def test_run_resumes_in_chunks():
+    """Stopping between chunks and pickling the game doesn't change the result"""
+    whole = CupGame(EXAMPLE_CUPS)
+    assert list(whole.run(100, chunk=100)) == [100]
+
+    chunked = CupGame(EXAMPLE_CUPS)
+    assert list(chunked.run(40, chunk=15)) == [15, 30, 40]
+    resumed = pickle.loads(pickle.dumps(chunked))
+    assert list(resumed.run(60, chunk=25)) == [65, 90, 100]
+
+    assert list(resumed.clockwise_of(1)) == list(whole.clockwise_of(1))
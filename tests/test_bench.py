@@ -0,0 +1,104 @@
+import logging
+
+import pytest
+
+import aoc.bench
+from aoc.__main__ import main
+from aoc.bench import (
+    BenchResult,
+    bench_key,
+    find_regressions,
+    load_baseline,
+    percentile,
+    run_bench,
+    save_baseline,
+)
+from aoc.util import Part
+
+
+def result(median: float) -> BenchResult:
+    return BenchResult(
+        runs=5, min=median * 0.9, median=median, p95=median * 1.2, peak_memory_kb=64
+    )
+
+
+def test_find_regressions():
+    baseline = {
+        "2020-12-01/1": result(1.0),
+        "2020-12-01/2": result(1.0),
+        "2020-12-02/1": result(1.0),
+    }
+    results = {
+        # Slower, but inside the threshold
+        "2020-12-01/1": result(1.05),
+        # Slower by more than the threshold
+        "2020-12-01/2": result(1.2),
+        # Faster
+        "2020-12-02/1": result(0.5),
+        # Not in the baseline, so nothing to compare with
+        "2020-12-03/1": result(100.0),
+    }
+    assert find_regressions(baseline, results, 0.1) == ["2020-12-01/2"]
+    assert find_regressions(baseline, results, 0.01) == [
+        "2020-12-01/1",
+        "2020-12-01/2",
+    ]
+
+
+def test_baseline_round_trip(tmp_path):
+    baseline_file = tmp_path / "bench" / "baseline.json"
+    first = {"2020-12-01/1": result(1.0), "2020-12-01/2": result(2.0)}
+    save_baseline(baseline_file, first)
+    assert load_baseline(baseline_file) == first
+
+    # Saving again updates what we ran and keeps the rest
+    save_baseline(baseline_file, {"2020-12-01/2": result(1.5)})
+    assert load_baseline(baseline_file) == {
+        "2020-12-01/1": result(1.0),
+        "2020-12-01/2": result(1.5),
+    }
+
+
+def test_percentile():
+    assert percentile([3.0], 95) == 3.0
+    timings = [float(i) for i in range(1, 102)]
+    assert percentile(timings, 95) == pytest.approx(96.0)
+
+
+@pytest.mark.parametrize("repeat", ("0", "-1"))
+def test_repeat_must_be_positive(repeat: str):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["bench", "--year", "2020", "--repeat", repeat])
+    assert exc_info.value.code == 2
+
+
+def test_compare_without_baseline(tmp_path, monkeypatch, caplog):
+    def bench_part(year, day, part, repeat, warmup):
+        return result(1.0)
+
+    monkeypatch.setattr(aoc.bench, "bench_part", bench_part)
+    caplog.set_level(logging.INFO, logger="aoc.bench")
+    baseline_file = tmp_path / "baseline.json"
+    assert run_bench([2020], [1], [1], baseline_file=baseline_file, compare=True)
+    assert "nothing to compare against" in caplog.text
+
+    # The first --compare --save starts the baseline
+    run_bench([2020], [1], [1], baseline_file=baseline_file, save=True, compare=True)
+    assert load_baseline(baseline_file) == {bench_key(2020, 1, Part.ONE): result(1.0)}
+
+
+def test_errors_dont_stop_the_bench(tmp_path, monkeypatch, caplog):
+    def bench_part(year, day, part, repeat, warmup):
+        if day == 1:
+            raise FileNotFoundError("no input")
+        if day == 2:
+            raise SystemExit(1)
+        return result(float(day))
+
+    monkeypatch.setattr(aoc.bench, "bench_part", bench_part)
+    caplog.set_level(logging.INFO, logger="aoc.bench")
+    baseline_file = tmp_path / "baseline.json"
+    assert not run_bench([2020], [1, 2, 3], [1], baseline_file=baseline_file, save=True)
+    assert "FileNotFoundError: no input" in caplog.text
+    assert "SystemExit: 1" in caplog.text
+    assert load_baseline(baseline_file) == {bench_key(2020, 3, Part.ONE): result(3.0)}
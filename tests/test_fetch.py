@@ -0,0 +1,120 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aoc.fetch import fetch_year
+from aoc.util import find_input_file, find_input_hash_file
+
+YEAR = 2015
+COOKIE = "test-cookie"
+MISSING_DAY = 4
+SLOW_DAY = 5
+SLOW_DAY_DELAY = 2.0
+
+
+def puzzle_input(day: int) -> bytes:
+    return f"input for day {day}\n".encode() * 100
+
+
+class AocStandIn(BaseHTTPRequestHandler):
+    """Serves /YEAR/day/DAY/input to requests carrying the right session cookie"""
+
+    requests_seen: list[str] = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        parts = self.path.strip("/").split("/")
+        if self.headers.get("Cookie") != f"session={COOKIE}":
+            self.send_error(400)
+        elif (
+            len(parts) != 4
+            or parts[0] != str(YEAR)
+            or parts[3] != "input"
+            or int(parts[2]) == MISSING_DAY
+        ):
+            self.send_error(404)
+        else:
+            if int(parts[2]) == SLOW_DAY:
+                time.sleep(SLOW_DAY_DELAY)
+            body = puzzle_input(int(parts[2]))
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    AocStandIn.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), AocStandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(server: str, input_dir, days: list[int], **kwargs) -> bool:
+    return fetch_year(
+        YEAR,
+        days,
+        jobs=3,
+        interval=0.0,
+        base_url=server,
+        cookie=COOKIE,
+        input_dir=input_dir,
+        **kwargs,
+    )
+
+
+def test_fetch_writes_inputs_and_hashes(server, tmp_path):
+    days = [1, 2, 3]
+    assert fetch(server, tmp_path, days)
+
+    for day in days:
+        input_file = find_input_file(YEAR, day, tmp_path)
+        data = input_file.read_bytes()
+        assert data == puzzle_input(day)
+        hash_file = find_input_hash_file(input_file)
+        assert hash_file.read_text() == hashlib.sha256(data).hexdigest()
+
+    # No temp files left behind
+    assert len(list(tmp_path.iterdir())) == 2 * len(days)
+
+
+def test_fetch_skips_valid_inputs(server, tmp_path):
+    assert fetch(server, tmp_path, [1, 2])
+    AocStandIn.requests_seen = []
+
+    assert fetch(server, tmp_path, [1, 2, 3])
+    assert AocStandIn.requests_seen == [f"/{YEAR}/day/3/input"]
+
+
+def test_fetch_replaces_corrupt_input(server, tmp_path):
+    assert fetch(server, tmp_path, [1])
+    input_file = find_input_file(YEAR, 1, tmp_path)
+    input_file.write_bytes(puzzle_input(1)[:10])
+
+    assert fetch(server, tmp_path, [1])
+    assert input_file.read_bytes() == puzzle_input(1)
+
+
+def test_fetch_failure_leaves_no_file(server, tmp_path):
+    assert not fetch(server, tmp_path, [3, MISSING_DAY])
+    assert find_input_file(YEAR, 3, tmp_path).exists()
+    assert not find_input_file(YEAR, MISSING_DAY, tmp_path).exists()
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_fetch_timeout(server, tmp_path):
+    start = time.monotonic()
+    assert not fetch(server, tmp_path, [1, SLOW_DAY], timeout=0.2)
+    assert time.monotonic() - start < SLOW_DAY_DELAY
+    assert find_input_file(YEAR, 1, tmp_path).exists()
+    assert not find_input_file(YEAR, SLOW_DAY, tmp_path).exists()
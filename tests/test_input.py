@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from aoc.util import (
+    bytes_to_grid,
+    find_input_file,
+    get_input_file_bytes,
+    get_input_file_grid,
+    get_input_file_line_tuple,
+    get_input_file_lines,
+    lines_to_grid,
+    write_input_file,
+)
+
+YEAR = 2015
+DAY = 6
+INPUT = b"#..#  \n.##.\n#..#\n"
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    write_input_file(find_input_file(YEAR, DAY, tmp_path), INPUT)
+    return tmp_path
+
+
+def test_bytes(input_dir):
+    data = get_input_file_bytes(YEAR, DAY, input_dir)
+    assert data == INPUT
+    # Cached, and str or int year and day share the cache
+    assert get_input_file_bytes(str(YEAR), str(DAY), input_dir) is data
+
+
+def test_lines(input_dir):
+    expected = ("#..#", ".##.", "#..#")
+    assert get_input_file_line_tuple(YEAR, DAY, input_dir) == expected
+    assert get_input_file_line_tuple(YEAR, DAY, input_dir) is (
+        get_input_file_line_tuple(YEAR, DAY, input_dir)
+    )
+    # Each call gets a fresh iterator
+    assert list(get_input_file_lines(YEAR, DAY, input_dir)) == list(expected)
+    assert list(get_input_file_lines(YEAR, DAY, input_dir)) == list(expected)
+
+
+def test_grid(input_dir):
+    find_input_file(YEAR, DAY + 1, input_dir).write_bytes(b"ab\ncd")
+    grid = get_input_file_grid(YEAR, DAY + 1, input_dir)
+    assert grid.dtype == np.uint8
+    assert grid.tolist() == [[ord("a"), ord("b")], [ord("c"), ord("d")]]
+    assert not grid.flags.writeable
+
+    # Trailing spaces on the first row make this input ragged
+    with pytest.raises(ValueError):
+        get_input_file_grid(YEAR, DAY, input_dir)
+
+
+def test_lines_to_grid():
+    grid = lines_to_grid(["#.", ".#"])
+    assert (grid == ord("#")).tolist() == [[True, False], [False, True]]
+    grid[0, 0] = ord(".")
+
+    with pytest.raises(ValueError):
+        bytes_to_grid(b"abc\nde\nf\n")
@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+
+import aoc.run
+from aoc.__main__ import main
+from aoc.profiling import Profiler, ProfileMode
+
+LINES = [str(n) for n in range(20_000)]
+
+
+def trivial_part(lines):
+    """Sums the lines, keeping each partial sum so there are allocations to see"""
+    totals = []
+    for line in lines:
+        totals.append((totals[-1] if totals else 0) + int(line))
+    return totals[-1]
+
+
+def profile_log(caplog) -> str:
+    return "\n".join(
+        record.getMessage()
+        for record in caplog.records
+        if record.name == "aoc.profiling"
+    )
+
+
+def test_cprofile(caplog):
+    caplog.set_level(logging.INFO, logger="aoc.profiling")
+    result = Profiler(ProfileMode.CPROFILE, top=5).run(trivial_part, LINES)
+    assert result == sum(range(20_000))
+    report = profile_log(caplog)
+    assert "function calls" in report
+    assert "trivial_part" in report
+
+
+def test_tracemalloc(caplog, tmp_path):
+    caplog.set_level(logging.INFO, logger="aoc.profiling")
+    collapsed_file = tmp_path / "stacks.txt"
+    Profiler(ProfileMode.TRACEMALLOC, 5, collapsed_file).run(trivial_part, LINES)
+    report = profile_log(caplog)
+    assert "Peak traced memory" in report
+    assert "test_profiling.py" in report
+    stacks = collapsed_file.read_text().splitlines()
+    assert stacks and all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+
+
+def test_sampling(caplog, tmp_path):
+    caplog.set_level(logging.INFO, logger="aoc.profiling")
+    collapsed_file = tmp_path / "stacks.txt"
+    Profiler(ProfileMode.SAMPLING, 5, collapsed_file).run(trivial_part, LINES * 20)
+    report = profile_log(caplog)
+    assert "Top 5 functions by own samples" in report
+    assert "trivial_part" in report
+    assert "trivial_part" in collapsed_file.read_text()
+
+
+@pytest.mark.parametrize("mode", [mode.value for mode in ProfileMode])
+def test_main_profile(mode, monkeypatch, caplog):
+    """--profile builds a profiler for run_puzzle, which profiles the real input"""
+
+    def run_puzzle(datestamp, parts_arg, profiler):
+        assert (datestamp, parts_arg) == ("2020-12-01", [1])
+        return profiler.run(trivial_part, LINES) is not None
+
+    monkeypatch.setattr(aoc.run, "run_puzzle", run_puzzle)
+    caplog.set_level(logging.INFO, logger="aoc.profiling")
+    args = ["--date", "2020-12-01", "--part", "1", "--profile", mode]
+    assert main([*args, "--profile-top", "3"]) == 0
+    assert profile_log(caplog)
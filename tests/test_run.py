@@ -0,0 +1,134 @@
+import concurrent.futures
+import functools
+import logging
+import sys
+import textwrap
+
+import pytest
+
+import aoc
+from aoc.__main__ import main
+from aoc.run import run_puzzle_part_report, run_year
+from aoc.util import Part
+
+YEAR = 1999
+
+# Day 1 gets part one right and part two wrong.
+# Day 2 crashes in part one and doesn't know its part two answer yet.
+FAKE_DAYS = {
+    1: """
+        PART_ONE_EXAMPLE = "1\\n2\\n"
+        PART_ONE_EXAMPLE_RESULT = 3
+        PART_ONE_RESULT = 60
+        PART_TWO_EXAMPLE = PART_ONE_EXAMPLE
+        PART_TWO_EXAMPLE_RESULT = 2
+        PART_TWO_RESULT = 0
+
+
+        def part_one(lines):
+            return sum(map(int, lines))
+
+
+        def part_two(lines):
+            return len(list(lines))
+        """,
+    2: """
+        PART_ONE_EXAMPLE = ""
+        PART_ONE_EXAMPLE_RESULT = None
+        PART_ONE_RESULT = 1
+        PART_TWO_EXAMPLE = ""
+        PART_TWO_EXAMPLE_RESULT = None
+        PART_TWO_RESULT = None
+
+
+        def part_one(lines):
+            raise ValueError("no solution")
+
+
+        def part_two(lines):
+            return 42
+        """,
+}
+
+
+def add_package_dir(package_dir: str) -> None:
+    """Worker initializer, so the fake year package can be imported there too"""
+    aoc.__path__.append(package_dir)
+
+
+@pytest.fixture
+def fake_year(tmp_path, monkeypatch):
+    """A year package with two days, and an input for each day.
+    Returns the input directory."""
+    package_dir = tmp_path / "packages"
+    year_dir = package_dir / f"aoc{YEAR}"
+    year_dir.mkdir(parents=True)
+    (year_dir / "__init__.py").write_text("")
+    input_dir = tmp_path / "inputs"
+    input_dir.mkdir()
+    for day, source in FAKE_DAYS.items():
+        (year_dir / f"day_{day:02}.py").write_text(textwrap.dedent(source))
+        (input_dir / f"{YEAR}-12-{day:02}.txt").write_text("10\n20\n30\n")
+
+    monkeypatch.setattr(aoc, "__path__", [*aoc.__path__, str(package_dir)])
+    # run_year's workers are spawned, so they need to be told about it too
+    monkeypatch.setattr(
+        concurrent.futures,
+        "ProcessPoolExecutor",
+        functools.partial(
+            concurrent.futures.ProcessPoolExecutor,
+            initializer=add_package_dir,
+            initargs=(str(package_dir),),
+        ),
+    )
+    yield input_dir
+    for name in list(sys.modules):
+        if name.startswith(f"aoc.aoc{YEAR}"):
+            del sys.modules[name]
+
+
+def test_part_report(fake_year):
+    report = run_puzzle_part_report(YEAR, 1, Part.ONE, fake_year)
+    assert (report.expected, report.actual, report.error) == (60, 60, None)
+    assert report.passed is True
+    assert report.wall_time >= 0 and report.peak_rss_kb > 0
+
+
+def test_part_report_error(fake_year):
+    report = run_puzzle_part_report(YEAR, 2, Part.ONE, fake_year)
+    assert report.error == "ValueError: no solution"
+    assert report.passed is False
+    assert "ValueError: no solution" in str(report)
+
+
+def test_run_year(fake_year, caplog):
+    caplog.set_level(logging.INFO, logger="aoc.run")
+    assert not run_year(YEAR, jobs=2, input_dir=fake_year)
+
+    report_lines = [record.getMessage() for record in caplog.records]
+    assert report_lines[-1].startswith("1 passed, 2 failed, 1 unknown.")
+    day_part_lines = {tuple(line.split()[:2]): line for line in report_lines[1:-1]}
+    assert set(day_part_lines) == {("1", "1"), ("1", "2"), ("2", "1"), ("2", "2")}
+    assert "ValueError: no solution" in day_part_lines[("2", "1")]
+    assert "no expected result yet" in day_part_lines[("2", "2")]
+
+
+def test_run_year_passed(fake_year, caplog):
+    caplog.set_level(logging.INFO, logger="aoc.run")
+    (fake_year.parent / "packages" / f"aoc{YEAR}" / "day_02.py").unlink()
+    assert run_year(YEAR, parts_arg=[1], jobs=1, input_dir=fake_year)
+    assert caplog.records[-1].getMessage().startswith("1 passed, 0 failed, 0 unknown.")
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        ["--year", "2020", "--all", "--jobs", "0"],
+        ["--year", "2020", "--all", "--jobs", "-1"],
+        ["fetch", "--year", "2020", "--jobs", "0"],
+    ),
+)
+def test_jobs_must_be_positive(args: list[str]):
+    with pytest.raises(SystemExit) as exc_info:
+        main(args)
+    assert exc_info.value.code == 2
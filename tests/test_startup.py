@@ -0,0 +1,18 @@
+from aoc.startup import (
+    DEFERRED_MODULES,
+    STARTUP_BUDGET_MS,
+    import_times,
+    startup_modules,
+    total_import_time_us,
+)
+
+
+def test_cold_start_budget():
+    times = import_times(startup_modules(2015, 1))
+    assert total_import_time_us(times) / 1000 < STARTUP_BUDGET_MS
+
+
+def test_heavy_modules_deferred():
+    for year, day in ((2015, 1), (2023, 10), (2023, 25), (2024, 23)):
+        imported = {t.module for t in import_times(startup_modules(year, day))}
+        assert imported.isdisjoint(DEFERRED_MODULES), (year, day)